@@ -1,67 +1,91 @@
-import requests
+import os
+import sys
 import pandas as pd
-from io import StringIO
-
-# Define the URLs and station IDs
-urls = [
-    "https://www.ndbc.noaa.gov/view_text_file.php?filename=41010h2012.txt.gz&dir=data/historical/stdmet/",
-    "https://www.ndbc.noaa.gov/view_text_file.php?filename=42058h2012.txt.gz&dir=data/historical/stdmet/",
-    "https://www.ndbc.noaa.gov/view_text_file.php?filename=41013h2012.txt.gz&dir=data/historical/stdmet/",
-    "https://www.ndbc.noaa.gov/view_text_file.php?filename=44009h2012.txt.gz&dir=data/historical/stdmet/",
-]
-
-# Mapping of station IDs to latitude and longitude
-station_coords = {
-    "44009": (38.460, -74.692),
-    "41013": (33.441, -77.764),
-    "42058": (14.512, -75.153),
-    "41010": (28.878, -78.467),
-}
-
-# Date range for filtering
-date_range = pd.date_range("2012-10-20", "2012-10-31").strftime("%Y %m %d").tolist()
-
-# Column names based on the provided format
-columns = [
-    "YY", "MM", "DD", "hh", "mm", "WDIR", "WSPD", "GST", "WVHT", "DPD", "APD", "MWD",
-    "PRES", "ATMP", "WTMP", "DEWP", "VIS", "TIDE"
-]
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from buoy.catalog import StormCatalog
+from buoy.fetch import NDBC_BASE_URL, timed_fetch
+from buoy.stations import KNOWN_STATIONS, load_registry
+from buoy.stdmet import read_stdmet
+from buoy.store import PartitionedStore
+from buoy.timeparse import range_mask
+from buoy.trace import Tracer
+
+# Stations and years to download
+stations = ["41010", "42058", "41013", "44009"]
+years = [2012]
+
+# Raw .txt.gz files are kept here so re-runs skip the download
+download_dir = "stdmet"
+
+# Every download is also appended to the per-station/per-year store
+store = PartitionedStore("store")
+
+# Point this at a local stand-in (python -m buoy.standin) to work offline
+base_url = os.environ.get("NDBC_BASE_URL", NDBC_BASE_URL)
+
+# Station latitude/longitude: the positions the 0056 stations had in 2012, and
+# the NDBC station registry (today's positions, loaded only if needed) for others
+registry = None
+
+# Date range for filtering (inclusive)
+start = pd.Timestamp("2012-10-20 00:00")
+end = pd.Timestamp("2012-10-31 23:59")
+
+# Time and rows of every step go to download_trace.json. Memory peaks need
+# tracemalloc, which slows the CSV write about 10x, so they are opt-in:
+# BUOY_TRACE_MEMORY=1 python download.py
+tracer = Tracer(memory=os.environ.get("BUOY_TRACE_MEMORY", "") not in ("", "0"))
 
 # Initialize an empty list to store dataframes
 all_data = []
 
-for url in urls:
-    station_id = url.split("filename=")[1][:5]  # Extract station ID from URL
-    response = requests.get(url)
-    if response.status_code == 200:
-        lines = response.text.splitlines()
-        
-        # Remove header lines
-        data_lines = [line for line in lines if not line.startswith("#")]
-        
-        # Convert to DataFrame
-        df = pd.read_csv(StringIO("\n".join(data_lines)), delim_whitespace=True, names=columns, skiprows=1)
-        
-        # Ensure date columns are integers before formatting
-        df["YY"] = df["YY"].astype(int)
-        df["MM"] = df["MM"].astype(int)
-        df["DD"] = df["DD"].astype(int)
-        
-        # Filter by date range
-        df_filtered = df[df.apply(lambda row: f"{int(row.YY)} {int(row.MM):02d} {int(row.DD):02d}" in date_range, axis=1)]
-        
-        # Add station_id, latitude, and longitude columns
-        df_filtered["station_id"] = station_id
-        df_filtered["latitude"], df_filtered["longitude"] = station_coords.get(station_id, (None, None))
-        
-        # Append to list
-        all_data.append(df_filtered)
-    else:
-        print(f"Failed to download data for station {station_id}")
-
-# Concatenate all data into a single DataFrame
-final_df = pd.concat(all_data, ignore_index=True)
-
-# Save to CSV
-final_df.to_csv("all_stations_october_2012.csv", index=False)
+# Fetch every station/year concurrently over pooled connections
+with tracer.stage("fetch") as stage:
+    results = timed_fetch([(s, y) for s in stations for y in years], download_dir, base_url=base_url)
+    stage.rows_out = len(results)
+
+for result in results:
+    station_id = result["station"]
+    if result["path"]:
+        with tracer.stage(f"station {station_id} {result['year']}"):
+            # Stream the .txt.gz straight into typed columns, skipping header lines
+            with tracer.stage("parse") as stage:
+                df = read_stdmet(result["path"])
+                stage.rows_out = len(df)
+
+            # Only rows newer than what the store already holds are written, with
+            # sentinels masked; the CSV keeps NDBC's raw values for the 0056 scripts
+            with tracer.stage("ingest", rows_in=len(df)) as stage:
+                stage.rows_out = store.ingest(df, station_id)
+
+            # Filter by date range with vectorized integer comparisons
+            with tracer.stage("filter", rows_in=len(df)) as stage:
+                df_filtered = df[range_mask(df, start, end)]
+                stage.rows_out = len(df_filtered)
+
+            # Add station_id, latitude, and longitude columns
+            df_filtered["station_id"] = station_id
+            if station_id in KNOWN_STATIONS:
+                location = KNOWN_STATIONS[station_id]
+            else:
+                registry = registry or load_registry()
+                location = registry.location(station_id)
+            df_filtered["latitude"], df_filtered["longitude"] = location
+
+            # Append to list
+            all_data.append(df_filtered)
+
+# Bring the storm catalog up to date with whatever was just ingested
+with tracer.stage("catalog") as stage:
+    stage.rows_out = len(StormCatalog(store).update(stations))
+
+# Concatenate all data into a single DataFrame and save to CSV
+with tracer.stage("write") as stage:
+    final_df = pd.concat(all_data, ignore_index=True)
+    final_df.to_csv("all_stations_october_2012.csv", index=False)
+    stage.rows_out = len(final_df)
 print("Saved all_stations_october_2012.csv")
+
+tracer.save("download_trace.json")
+print(tracer.summary())
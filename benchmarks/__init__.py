@@ -0,0 +1,2 @@
+# Benchmarks for the buoy helpers, run from the repository root, e.g.
+#   python -m benchmarks.datetime_build
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from buoy.timeparse import build_datetime, range_mask
+
+START = pd.Timestamp("2012-10-20 00:00")
+END = pd.Timestamp("2012-10-31 23:59")
+
+
+def make_year(year=2012):
+    # One station-year of 10-minute readings
+    idx = pd.date_range(f"{year}-01-01", f"{year}-12-31 23:50", freq="10min")
+    return pd.DataFrame({"YY": idx.year, "MM": idx.month, "DD": idx.day,
+                         "hh": idx.hour, "mm": idx.minute})
+
+
+def apply_filter(df):
+    # The original row-wise filter from download.py
+    date_range = pd.date_range("2012-10-20", "2012-10-31").strftime("%Y %m %d").tolist()
+    return df[df.apply(lambda row: f"{int(row.YY)} {int(row.MM):02d} {int(row.DD):02d}" in date_range, axis=1)]
+
+
+def mask_filter(df):
+    return df[range_mask(df, START, END)]
+
+
+def searchsorted_filter(df):
+    values, valid = build_datetime(df["YY"].to_numpy(), df["MM"].to_numpy(), df["DD"].to_numpy(),
+                                   df["hh"].to_numpy(), df["mm"].to_numpy())
+    lo = np.searchsorted(values, np.datetime64(START), side="left")
+    hi = np.searchsorted(values, np.datetime64(END), side="right")
+    return df.iloc[lo:hi]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare date-range filters on one station-year")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_year()
+    expected = apply_filter(df)
+    print(f"{len(df):,} rows, {len(expected):,} in range")
+    for name, func in [("apply", apply_filter), ("range_mask", mask_filter),
+                       ("searchsorted", searchsorted_filter)]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = func(df)
+            best = min(best, time.perf_counter() - start)
+        assert result.index.equals(expected.index), name
+        print(f"{name:>14}: {best * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
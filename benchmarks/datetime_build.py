@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from buoy.timeparse import build_datetime
+
+DEFAULT_ROWS = [1_000_000, 10_000_000, 50_000_000]
+
+
+def make_parts(rows):
+    # Consecutive 10-minute readings starting 2000-01-01
+    stamps = np.datetime64("2000-01-01", "m") + np.arange(rows) * np.timedelta64(10, "m")
+    idx = pd.DatetimeIndex(stamps)
+    return pd.DataFrame({
+        "YY": idx.year.astype("int16"), "MM": idx.month.astype("int8"),
+        "DD": idx.day.astype("int8"), "hh": idx.hour.astype("int8"),
+        "mm": idx.minute.astype("int8"),
+    })
+
+
+def pandas_idiom(df):
+    return pd.to_datetime(df[['YY', 'MM', 'DD', 'hh', 'mm']].rename(
+        columns={'YY': 'year', 'MM': 'month', 'DD': 'day', 'hh': 'hour', 'mm': 'minute'}))
+
+
+def vectorized(df):
+    values, valid = build_datetime(df['YY'].to_numpy(), df['MM'].to_numpy(), df['DD'].to_numpy(),
+                                   df['hh'].to_numpy(), df['mm'].to_numpy())
+    return values
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare datetime construction methods")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'pandas (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for rows in args.rows:
+        df = make_parts(rows)
+        t_pandas, expected = timed(pandas_idiom, df)
+        t_vec, got = timed(vectorized, df)
+        assert np.array_equal(expected.to_numpy(), got), "results differ"
+        print(f"{rows:>12,} {t_pandas:>12.3f} {t_vec:>15.3f} {t_pandas / t_vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
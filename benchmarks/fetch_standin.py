@@ -0,0 +1,50 @@
+import argparse
+import os
+import tempfile
+import time
+
+from buoy.fetch import fetch_stdmet, stdmet_filename, summarize
+from buoy.loader import load_stdmet
+from buoy.standin import start_server, write_fixture
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "0056", "all_stations_october_2012.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch fixture files from the local stand-in server")
+    parser.add_argument("--stations", type=int, default=40)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds of latency per request")
+    parser.add_argument("--fail-first", type=int, default=1, help="503s served before each file succeeds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+
+    sample = load_stdmet(SAMPLE_CSV, use_cache=False)
+    stations = [f"{41000 + i}" for i in range(args.stations)]
+    years = range(2012, 2012 + args.years)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_dir = os.path.join(tmp, "fixtures")
+        os.makedirs(fixture_dir)
+        for station in stations:
+            for year in years:
+                write_fixture(sample, os.path.join(fixture_dir, stdmet_filename(station, year)))
+        # One job with no file on the server, to check 404s are reported, not retried
+        jobs = [(s, y) for s in stations for y in years] + [("99999", 2012)]
+
+        for workers in args.workers:
+            server, base_url = start_server(fixture_dir, delay=args.delay, fail_first=args.fail_first)
+            dest = os.path.join(tmp, f"out_{workers}")
+            start = time.perf_counter()
+            results = fetch_stdmet(jobs, dest, base_url=base_url, max_workers=workers,
+                                   per_host=workers, backoff=0.01)
+            elapsed = time.perf_counter() - start
+            print(f"\n{workers} worker(s):")
+            summarize([r for r in results if r["station"] != "99999"], elapsed)
+            missing = [r for r in results if r["station"] == "99999"]
+            print(f"Missing station reported as error: {missing[0]['error'] is not None}")
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
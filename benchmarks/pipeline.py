@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import resource
+import time
+
+from buoy import synthetic
+from buoy.loader import read_stdmet_csv
+from buoy.plotting import frame_series, new_figure, plot_lines, save_figure
+from buoy.quality import mask_frame
+from buoy.storms import detect_storms
+from buoy.timeparse import add_datetime
+from buoy.trace import Tracer
+
+DEFAULT_SCALES = [1, 100, 10_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "pipeline_baseline.json")
+MEASUREMENTS = ["WDIR", "WSPD", "GST", "WVHT", "DPD", "APD", "MWD", "PRES", "ATMP", "WTMP", "DEWP"]
+
+
+def dataset(data_dir, scale):
+    """Synthetic CSV for a scale, generated once and reused."""
+    path = os.path.join(data_dir, f"synthetic_x{scale}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        stations, kwargs = synthetic.scale_plan(scale)
+        start = time.perf_counter()
+        rows = synthetic.write_csv(path + ".tmp", stations, **kwargs)
+        os.replace(path + ".tmp", path)
+        print(f"  generated {rows:,} rows ({stations} stations) in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+# Each stage takes the state dict, updates it and returns the rows it produced
+
+def stage_load(state):
+    state["df"] = read_stdmet_csv(state["path"])
+    return len(state["df"])
+
+
+def stage_overview(state):
+    # The 0054 data overview: describe(include='all') and duplicated()
+    df = state["df"]
+    state["describe"] = df.describe(include="all")
+    state["duplicates"] = int(df.duplicated().sum())
+    return len(df)
+
+
+def stage_clean(state):
+    df = state["df"]
+    df[MEASUREMENTS] = df[MEASUREMENTS].astype("float64")
+    mask_frame(df, MEASUREMENTS)
+    return len(df)
+
+
+def stage_datetime(state):
+    valid = add_datetime(state["df"])
+    return int(valid.sum())
+
+
+def stage_storms(state):
+    df = state["df"]
+    state["storms"] = [detect_storms([group]) for _, group in df.groupby("station_id", sort=False)]
+    return sum(len(s) for s in state["storms"])
+
+
+def stage_aggregate(state):
+    df = state["df"]
+    daily = df.groupby(["station_id", df["datetime"].dt.floor("D")])["WVHT"].agg(["max", "mean"])
+    monthly = df.groupby(["station_id", "YY", "MM"])["WVHT"].mean()
+    state["daily"] = daily
+    return len(daily) + len(monthly)
+
+
+def stage_plot(state):
+    df = state["df"]
+    fig, ax = new_figure()
+    plot_lines(ax, frame_series(df[["station_id", "datetime", "WVHT"]], "datetime", "WVHT",
+                                by="station_id"), legend=False)
+    save_figure(fig, os.path.join(state["data_dir"], f"plot_x{state['scale']}.png"))
+    return len(df)
+
+
+STAGES = [("load", stage_load), ("overview", stage_overview), ("clean", stage_clean),
+          ("datetime", stage_datetime), ("storms", stage_storms), ("aggregate", stage_aggregate),
+          ("plot", stage_plot)]
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_stages(scale, data_dir, memory):
+    state = {"path": dataset(data_dir, scale), "data_dir": data_dir, "scale": scale}
+    tracer = Tracer(memory=memory)
+    for name, stage in STAGES:
+        rows_in = len(state["df"]) if "df" in state else None
+        with tracer.stage(name, rows_in=rows_in) as record:
+            record.rows_out = stage(state)
+        record.max_rss_mb = max_rss_mb()
+    return tracer
+
+
+def run_scale(scale, data_dir, memory=True):
+    """Time the stages untraced, then (memory=True) rerun them under tracemalloc for the peaks.
+
+    tracemalloc slows allocation-heavy stages several times over, so the
+    seconds and the peaks never come from the same pass.
+    """
+    tracer = run_stages(scale, data_dir, memory=False)
+    if memory:
+        peaks = run_stages(scale, data_dir, memory=True).records
+        for record, traced in zip(tracer.records, peaks):
+            record.peak = traced.peak
+    results = {}
+    for record in tracer.records:
+        results[record.path] = {"seconds": round(record.wall, 4), "cpu_seconds": round(record.cpu, 4),
+                                "rows": record.rows_out, "peak_mb": round(record.peak / 2 ** 20, 1),
+                                "max_rss_mb": round(record.max_rss_mb, 1)}
+    return results, tracer
+
+
+def compare(results, baseline):
+    print(f"\n{'scale':>7} {'stage':<10} {'seconds':>9} {'baseline':>9} {'ratio':>7} "
+          f"{'peak MB':>8} {'baseline':>9}")
+    for scale, stages in results.items():
+        for name, r in stages.items():
+            b = baseline.get(scale, {}).get(name)
+            if b is None:
+                print(f"{scale:>7} {name:<10} {r['seconds']:>9.3f} {'-':>9} {'-':>7} {r['peak_mb']:>8.1f}")
+                continue
+            ratio = r["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+            flag = "  slower" if ratio > 1.2 else ""
+            print(f"{scale:>7} {name:<10} {r['seconds']:>9.3f} {b['seconds']:>9.3f} {ratio:>6.2f}x "
+                  f"{r['peak_mb']:>8.1f} {b['peak_mb']:>9.1f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the 0053-0056 pipeline stages on synthetic data")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="sizes relative to the 1,431-row 0056 sample")
+    parser.add_argument("--data-dir", default="bench_data")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--trace", action="store_true",
+                        help="print the stage summary and write trace_x<scale>.json to the data dir")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the second, tracemalloc pass that measures peak memory")
+    args = parser.parse_args()
+
+    new_figure()  # import matplotlib before any stage is timed
+    results = {}
+    for scale in args.scales:
+        print(f"scale x{scale:,}")
+        results[str(scale)], tracer = run_scale(scale, args.data_dir, not args.no_memory)
+        if args.trace:
+            tracer.save(os.path.join(args.data_dir, f"trace_x{scale}.json"))
+            print(tracer.summary())
+            continue
+        for name, r in results[str(scale)].items():
+            print(f"  {name:<10} {r['rows']:>12,} rows {r['seconds']:>9.3f}s "
+                  f"{r['peak_mb']:>9.1f} MB extra peak (max RSS {r['max_rss_mb']:,.0f} MB)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"\nSaved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
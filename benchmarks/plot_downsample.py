@@ -0,0 +1,63 @@
+import argparse
+import time
+
+import numpy as np
+
+from buoy.plotting import DEFAULT_WIDTH_PX, downsample, new_figure, plot_lines, save_figure
+
+
+def make_series(rows, stations, seed=0):
+    # Stations share one 10-minute clock; rows are split evenly between them
+    rng = np.random.default_rng(seed)
+    per_station = rows // stations
+    times = np.datetime64('2000-01-01', 'ns') + np.arange(per_station, dtype=np.int64) * 600_000_000_000
+    series = {}
+    for s in range(stations):
+        i = np.arange(per_station)
+        wvht = 1.5 + np.sin(i / 26_000 + s) + rng.normal(0, 0.3, per_station)
+        wvht[rng.integers(0, per_station, 20)] += 8  # short storm spikes
+        series[f"st{s}"] = (times, wvht)
+    return series
+
+
+def timed_figure(series, method, path):
+    start = time.perf_counter()
+    fig, ax = new_figure()
+    if method == "raw":
+        for label, (x, y) in series.items():
+            ax.plot(x, y, label=label, linewidth=1)
+    else:
+        plot_lines(ax, series, method=method)
+    save_figure(fig, path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Figure time: raw plot() vs downsampled LineCollection")
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--stations", type=int, default=10)
+    parser.add_argument("--raw-rows", type=int, default=2_000_000,
+                        help="plot() on every point is only timed up to this size")
+    args = parser.parse_args()
+
+    series = make_series(args.rows, args.stations)
+    new_figure()  # import matplotlib outside the timings
+
+    x, y = next(iter(series.values()))
+    for method in ["minmax", "lttb"]:
+        start = time.perf_counter()
+        dx, dy = downsample(x, y, DEFAULT_WIDTH_PX, method)
+        print(f"{method:>7} downsample of {len(x):,} points -> {len(dx):,}: "
+              f"{time.perf_counter() - start:.3f}s (peak kept: {np.nanmax(dy) == np.nanmax(y)})")
+
+    for method in ["minmax", "lttb"]:
+        elapsed = timed_figure(series, method, f"plot_{method}.png")
+        print(f"{method:>7} figure, {args.rows:,} points in {args.stations} series: {elapsed:.3f}s")
+
+    small = make_series(args.raw_rows, args.stations)
+    print(f"    raw figure, {args.raw_rows:,} points: {timed_figure(small, 'raw', 'plot_raw.png'):.3f}s")
+    print(f" minmax figure, {args.raw_rows:,} points: {timed_figure(small, 'minmax', 'plot_small.png'):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
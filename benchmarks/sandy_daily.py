@@ -0,0 +1,64 @@
+import argparse
+import time
+
+import pandas as pd
+
+from buoy import synthetic
+from buoy.daily import DailyTable, bubble_grid
+from buoy.plotting import save_figure
+from buoy.timeparse import add_datetime
+
+
+def make_window(stations, days, seed=0):
+    frames = [df for _, df in synthetic.iter_stations(stations, [2012], seed=seed,
+                                                      start="2012-10-01", periods=days * 144)]
+    window = pd.concat(frames, ignore_index=True)
+    add_datetime(window)
+    window["storm_intensity"] = window["WSPD"] * window["WVHT"]
+    return window
+
+
+def rescan_days(window, dates):
+    # The 0056 loop: one full pass over the window per chart
+    date_data = {}
+    for date in dates:
+        date_df = window[window["datetime"].dt.date == date.date()]
+        date_data[date.strftime("%Y-%m-%d")] = date_df.groupby(
+            ["station_id", "latitude", "longitude"], as_index=False)[
+            ["WSPD", "WVHT", "storm_intensity"]].mean()
+    return date_data
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="0056 bubble-chart tables: per-date rescans vs one daily table")
+    parser.add_argument("--stations", type=int, default=50)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--plot", action="store_true", help="also time rendering 4 and all days")
+    args = parser.parse_args()
+
+    window = make_window(args.stations, args.days)
+    dates = list(pd.date_range("2012-10-01", periods=args.days))
+    print(f"{len(window):,} rows, {args.stations} stations, {args.days} days")
+
+    for n in [4, args.days]:
+        _, rescan = timed(rescan_days, window, dates[:n])
+        table, build = timed(DailyTable, window)
+        _, lookup = timed(table.days, dates[:n])
+        print(f"  {n:>3} charts: rescans {rescan:7.3f}s   table {build:6.3f}s + lookups {lookup:6.3f}s")
+
+    if args.plot:
+        new = DailyTable(window)
+        for n in [4, args.days]:
+            _, seconds = timed(lambda: save_figure(bubble_grid(new, dates[:n]), f"bubbles_{n}.png"))
+            print(f"  render {n:>3} panels: {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
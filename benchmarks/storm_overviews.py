@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from buoy.storms import interpolate_pandas, storm_events_pandas, storm_overviews
+
+
+def make_series(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    i = np.arange(rows)
+    return pd.DataFrame({
+        'datetime': pd.date_range('2019-01-01', periods=rows, freq='10min'),
+        'WSPD': np.clip(8 + 6 * np.sin(i / 300) + rng.normal(0, 3, rows), 0, None).round(1),
+        'WVHT': np.clip(1.5 + 1.2 * np.sin(i / 300) + rng.normal(0, 0.5, rows), 0, None).round(2),
+    })
+
+
+def mask_overviews(df, storms):
+    # The per-storm boolean mask loop from 0055
+    rows = []
+    for idx, storm in storms.iterrows():
+        storm_data = df[(df['datetime'] >= storm['start_time']) & (df['datetime'] <= storm['end_time'])]
+        rows.append([storm_data['WSPD'].min(), storm_data['WSPD'].max(), storm_data['WSPD'].mean(),
+                     storm_data['WVHT'].min(), storm_data['WVHT'].max(), storm_data['WVHT'].mean()])
+    return np.array(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-storm overviews: boolean masks vs searchsorted spans")
+    parser.add_argument("--rows", type=int, default=315_000, help="about six years of 10-minute data")
+    args = parser.parse_args()
+
+    df = interpolate_pandas(make_series(args.rows))
+    storms = storm_events_pandas(df)
+    print(f"{len(df):,} rows, {len(storms):,} storms")
+
+    top5 = storms.nlargest(5, 'intensity_score')
+    for label, selection in [("top 5", top5), ("all", storms)]:
+        start = time.perf_counter()
+        expected = mask_overviews(df, selection)
+        t_mask = time.perf_counter() - start
+        start = time.perf_counter()
+        got = storm_overviews(df, selection)
+        t_index = time.perf_counter() - start
+        cols = ['wspd_min', 'wspd_max', 'wspd_mean', 'wvht_min', 'wvht_max', 'wvht_mean']
+        assert np.allclose(expected, got[cols].to_numpy()), label
+        print(f"{label:>6}: masks {t_mask * 1000:10.1f} ms   spans {t_index * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Shared helpers for the NDBC buoy analyses in 0053-0056
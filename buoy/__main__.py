@@ -0,0 +1,5 @@
+import sys
+
+from buoy.cli import main
+
+sys.exit(main())
@@ -0,0 +1,184 @@
+"""Animated storm-intensity bubble map over a whole event.
+
+`frame_table` turns a cleaned window (datetime, station_id, latitude,
+longitude, storm_intensity) into one row of station values per time step.
+Frames are drawn by a pool of worker processes. Each worker builds one Agg
+figure with the station labels, axes and a bubble scatter. It renders that
+static part once, then for every frame restores it and redraws only the
+scatter (with new sizes) and the timestamp. Raw RGB frames come back in
+order and are piped straight into the encoder: ffmpeg for MP4 (and for GIF
+when it is installed), otherwise Pillow for GIF.
+
+    animate(window, "sandy.gif", step="1h", fps=12)
+
+    python -m buoy sandy 0056/all_stations_october_2012.csv --animate sandy.gif
+"""
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+FIGSIZE = (8, 6)
+DPI = 100
+SCALE = 10
+CHUNK = 16
+
+
+def frame_table(window, step="1h", value="storm_intensity", time="datetime"):
+    """(times, stations, lon, lat, values) with values shaped (frames, stations).
+
+    Readings are averaged per station within each step; steps with no reading
+    for a station are NaN (drawn as no bubble).
+    """
+    bins = window[time].dt.floor(step)
+    grid = window.groupby([bins, window["station_id"]])[value].mean().unstack("station_id")
+    times = pd.date_range(grid.index.min(), grid.index.max(), freq=step)
+    grid = grid.reindex(times)
+    places = window.groupby("station_id")[["longitude", "latitude"]].first().loc[grid.columns]
+    return (times, list(grid.columns), places["longitude"].to_numpy(), places["latitude"].to_numpy(),
+            grid.to_numpy(dtype=np.float64))
+
+
+class FrameRenderer:
+    """One reusable figure; render(i) returns frame i as an (h, w, 3) uint8 array."""
+
+    def __init__(self, times, stations, lon, lat, values, title="Storm Intensity",
+                 figsize=FIGSIZE, dpi=DPI, scale=SCALE):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.times = times
+        self.values = values
+        self.scale = scale
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+        pad_x = max(np.ptp(lon) * 0.1, 0.5)
+        pad_y = max(np.ptp(lat) * 0.1, 0.5)
+        ax.set_xlim(lon.min() - pad_x, lon.max() + pad_x)
+        ax.set_ylim(lat.min() - pad_y, lat.max() + pad_y)
+        ax.set_xlabel("Longitude")
+        ax.set_ylabel("Latitude")
+        ax.set_title(title)
+        for station, x, y in zip(stations, lon, lat):
+            ax.text(x, y, str(station))
+        self.scatter = ax.scatter(lon, lat, s=np.zeros(len(lon)), alpha=0.5, animated=True)
+        self.stamp = ax.text(0.02, 0.97, "", transform=ax.transAxes, va="top", animated=True)
+        self.fig.tight_layout()
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax = ax
+
+    def render(self, i):
+        sizes = np.nan_to_num(self.values[i], nan=0.0) * self.scale
+        self.scatter.set_sizes(sizes)
+        self.stamp.set_text(pd.Timestamp(self.times[i]).strftime("%Y-%m-%d %H:%M"))
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.scatter)
+        self.ax.draw_artist(self.stamp)
+        return np.asarray(self.canvas.buffer_rgba())[..., :3].copy()
+
+
+_renderer = None
+
+
+def _init_worker(args, kwargs):
+    global _renderer
+    _renderer = FrameRenderer(*args, **kwargs)
+
+
+def _render_chunk(indices):
+    return b"".join(_renderer.render(i).tobytes() for i in indices)
+
+
+def frame_size(figsize=FIGSIZE, dpi=DPI):
+    """(width, height) in pixels of the frames FrameRenderer draws."""
+    return int(figsize[0] * dpi), int(figsize[1] * dpi)
+
+
+def iter_frames(table, workers=None, chunk=CHUNK, **kwargs):
+    """Yield raw RGB frame bytes in order, rendered by `workers` processes."""
+    n = len(table[0])
+    width, height = frame_size(kwargs.get("figsize", FIGSIZE), kwargs.get("dpi", DPI))
+    nbytes = width * height * 3
+    chunks = [range(start, min(start + chunk, n)) for start in range(0, n, chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _init_worker(table, kwargs)
+        results = map(_render_chunk, chunks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(table, kwargs))
+        results = pool.map(_render_chunk, chunks)
+    try:
+        for data in results:
+            for start in range(0, len(data), nbytes):
+                yield data[start:start + nbytes]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def encode_ffmpeg(path, frames, size, fps):
+    """Pipe raw RGB frames into ffmpeg (MP4, or GIF with a generated palette)."""
+    width, height = size
+    command = ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+               "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+    if path.endswith(".gif"):
+        command += ["-vf", "split[a][b];[a]palettegen[p];[b][p]paletteuse"]
+    else:
+        command += ["-pix_fmt", "yuv420p", "-vcodec", "libx264"]
+    process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+    count = 0
+    try:
+        for frame in frames:
+            process.stdin.write(frame)
+            count += 1
+    finally:
+        process.stdin.close()
+        if process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {process.returncode}")
+    return count
+
+
+def encode_gif(path, frames, size, fps):
+    """GIF through Pillow, streaming: each frame is mapped onto the first frame's palette.
+
+    append_images is consumed lazily, so only the current frame is held.
+    """
+    from PIL import Image
+
+    frames = iter(frames)
+    count = 0
+
+    def images():
+        nonlocal count
+        for frame in frames:
+            count += 1
+            yield Image.frombytes("RGB", size, frame).quantize(palette=palette, dither=Image.Dither.NONE)
+
+    first = Image.frombytes("RGB", size, next(frames))
+    palette = first.quantize(colors=255)
+    # optimize=False: the palette is fixed, and re-optimizing it costs 10x the encode
+    palette.save(path, save_all=True, append_images=images(), duration=int(round(1000 / fps)),
+                 loop=0, optimize=False)
+    return count + 1
+
+
+def animate(window, path, step="1h", fps=12, workers=None, value="storm_intensity", **kwargs):
+    """Render every step of the window to path (.gif or .mp4). Returns the frame count.
+
+    ffmpeg is used when it is on the PATH; without it only GIF (via Pillow) is available.
+    """
+    if shutil.which("ffmpeg"):
+        encode = encode_ffmpeg
+    elif path.endswith(".gif"):
+        encode = encode_gif
+    else:
+        raise RuntimeError("MP4 output needs ffmpeg on the PATH; write a .gif instead")
+    table = frame_table(window, step, value)
+    size = frame_size(kwargs.get("figsize", FIGSIZE), kwargs.get("dpi", DPI))
+    return encode(path, iter_frames(table, workers, **kwargs), size, fps)
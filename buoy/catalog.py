@@ -0,0 +1,349 @@
+"""Persisted storm catalog for a PartitionedStore.
+
+The 0055 storm events and the daily peak wave heights behind the 0054
+significant-storm days are kept in the store root, next to the data they
+come from:
+
+    _storms.feather        one row per storm event: station, start/end, peak and mean
+                           WSPD/WVHT, intensity_score, duration and the thresholds used
+    _daily_wvht.feather    daily maximum WVHT per station (missing readings left out)
+    _storms.json           thresholds; per station the rows seen in each partition and
+                           where the next update resumes
+
+`update()` only scans what was ingested since the last update. For each
+station with new rows it goes back LOOKBACK from the old end of the data, or
+further to the last valid WSPD/WVHT reading there (the rows after it were
+filled with that reading and now get real neighbours) and to the start of any
+storm still running at that point. Detection restarts from each column's last
+valid reading before that cut, so time interpolation has the same neighbours
+however long an outage is, and the events and days after the cut are
+replaced; the result matches a full rebuild. Each scan saves the next cut and
+those last valid readings in _storms.json along with the rows it has seen per
+partition, so an update reads only the partitions from that point on, each
+once. Rows landing in a partition older than the last one scanned make the
+station rescan in full.
+
+Queries use a start-sorted interval index per station and overall: storms
+overlapping [start, end] are the ones starting in [start - longest storm,
+end] with end >= start, found by two binary searches, so a window or a
+"top 5 in 2020" query costs O(log n + k) rather than a scan:
+
+    catalog = StormCatalog(PartitionedStore("store"))
+    catalog.update()
+    catalog.overlapping("2012-10-22", "2012-10-31")
+    catalog.top(5, year=2020)
+
+    python -m buoy.catalog store --update --top 5 --year 2020
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from buoy.quality import valid
+from buoy.storms import WSPD_THRESHOLD, WVHT_THRESHOLD, detect_storms
+from buoy.timeparse import add_datetime
+
+EVENTS = "_storms.feather"
+DAILY = "_daily_wvht.feather"
+STATE = "_storms.json"
+LOOKBACK = pd.Timedelta("1D")
+
+EVENT_COLUMNS = ["station_id", "start_time", "end_time", "duration", "duration_hours",
+                 "max_wspd", "mean_wspd", "max_wvht", "mean_wvht", "intensity_score",
+                 "wspd_threshold", "wvht_threshold"]
+DAILY_COLUMNS = ["station_id", "date", "max_wave_height"]
+
+
+class IntervalIndex:
+    """Intervals sorted by start, with the longest length kept for overlap queries."""
+
+    def __init__(self, starts, ends, rows):
+        order = np.argsort(starts, kind="stable")
+        self.starts = np.asarray(starts, dtype=np.int64)[order]
+        self.ends = np.asarray(ends, dtype=np.int64)[order]
+        self.rows = np.asarray(rows)[order]
+        self.max_length = int((self.ends - self.starts).max()) if len(self.starts) else 0
+
+    def overlapping(self, start, end):
+        """Rows of intervals with start <= end and end >= start (both inclusive)."""
+        lo = np.searchsorted(self.starts, start - self.max_length, side="left")
+        hi = np.searchsorted(self.starts, end, side="right")
+        hits = self.ends[lo:hi] >= start
+        return self.rows[lo:hi][hits]
+
+
+def _ns(value):
+    return pd.Timestamp(value).as_unit("ns").value
+
+
+def _empty_events():
+    frame = pd.DataFrame({col: pd.Series(dtype="float64") for col in EVENT_COLUMNS})
+    frame = frame.astype({"station_id": str, "duration": "int64"})
+    return frame.astype({"start_time": "datetime64[ns]", "end_time": "datetime64[ns]"})
+
+
+def _empty_daily():
+    return pd.DataFrame({"station_id": pd.Series(dtype=str), "date": pd.Series(dtype="datetime64[ns]"),
+                         "max_wave_height": pd.Series(dtype="float64")})
+
+
+class StormCatalog:
+    def __init__(self, store, wspd_threshold=WSPD_THRESHOLD, wvht_threshold=WVHT_THRESHOLD):
+        self.store = store
+        self.root = store.root
+        self.state_path = os.path.join(self.root, STATE)
+        self.events = _empty_events()
+        self.daily = _empty_daily()
+        self.state = {"wspd_threshold": wspd_threshold, "wvht_threshold": wvht_threshold,
+                      "stations": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            # A catalog built with other thresholds is rebuilt on the next update
+            if (state["wspd_threshold"], state["wvht_threshold"]) == (wspd_threshold, wvht_threshold):
+                self.state = state
+                self.events = feather.read_feather(os.path.join(self.root, EVENTS))
+                self.daily = feather.read_feather(os.path.join(self.root, DAILY))
+        self._build_index()
+
+    @property
+    def wspd_threshold(self):
+        return self.state["wspd_threshold"]
+
+    @property
+    def wvht_threshold(self):
+        return self.state["wvht_threshold"]
+
+    def _build_index(self):
+        starts = self.events["start_time"].to_numpy().view(np.int64)
+        ends = self.events["end_time"].to_numpy().view(np.int64)
+        rows = np.arange(len(self.events))
+        self.index = IntervalIndex(starts, ends, rows)
+        self.station_index = {}
+        for station, idx in self.events.groupby("station_id", sort=False).indices.items():
+            self.station_index[station] = IntervalIndex(starts[idx], ends[idx], rows[idx])
+
+    def save(self):
+        feather.write_feather(self.events, os.path.join(self.root, EVENTS), compression="uncompressed")
+        feather.write_feather(self.daily, os.path.join(self.root, DAILY), compression="uncompressed")
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    # --- incremental maintenance ---
+
+    def _station_partitions(self):
+        """{station: {partition key: rows}} from the store manifest."""
+        partitions = {}
+        for pkey, info in self.store.manifest["partitions"].items():
+            station = pkey.split("/")[0].split("=")[1]
+            partitions.setdefault(station, {})[pkey] = info["rows"]
+        return partitions
+
+    def _read(self, station, pkey):
+        year = int(pkey.split("/")[1].split("=")[1])
+        frame = self.store.read(stations=[station], years=[year],
+                                months=[int(pkey.split("=")[-1])] if self.store.by_month else None)
+        add_datetime(frame)
+        return frame
+
+    def _chunks(self, station, since=None):
+        """Time-ordered frames of a station from the store, one partition at a time."""
+        for pkey in self.store.partitions(stations=[station]):
+            fields = dict(part.split("=") for part in pkey.split("/"))
+            period = (int(fields["year"]), int(fields.get("month", 0)))
+            if since is not None and period < (since.year, since.month if "month" in fields else 0):
+                continue
+            frame = self._read(station, pkey)
+            if since is not None:
+                frame = frame[frame["datetime"] >= since]
+            if len(frame):
+                yield frame[["datetime", "WSPD", "WVHT", "QC"]].reset_index(drop=True)
+
+    def _resume_point(self, station, partitions):
+        """(cut, context) saved by the last scan, or None if the station needs a full scan.
+
+        Rows only ever arrive after a partition's last reading, so appended rows
+        start after the old end of the data unless they land in an earlier
+        partition than the last one scanned.
+        """
+        info = self.state["stations"].get(station, {})
+        if "resume" not in info:
+            return None
+        seen = info["partitions"]
+        last = max(seen)
+        if any(pkey < last for pkey, rows in partitions.items() if seen.get(pkey) != rows):
+            return None
+        cut = pd.Timestamp(info["resume"])
+        # Interpolation across the cut needs each column's previous valid reading
+        context = min([cut] + [pd.Timestamp(t) for t in info["last_valid"].values()])
+        return cut, context
+
+    def _save_resume_point(self, station, frames):
+        """Record where the next update restarts, from the rows this scan read.
+
+        The next cut goes back LOOKBACK from the end of the data, further to the
+        last valid WSPD/WVHT reading (the rows after it were filled with that
+        reading and will get real neighbours) and to the start of any storm still
+        running there, then to the start of the day. A column that has never had
+        a valid reading does not move it: its leading NaNs stay NaN either way.
+        The last valid reading of each column before that cut is kept too, so the
+        next scan starts there instead of searching older partitions for it.
+        """
+        rows = pd.concat(frames, ignore_index=True)
+        times = rows["datetime"]
+        end = times.iloc[-1]
+        last = {col: times[present].iloc[-1] for col in ["WSPD", "WVHT"]
+                for present in [valid(rows, [col])] if present.any()}
+        cut = min([end - LOOKBACK] + list(last.values()))
+        mine = self.events[self.events["station_id"] == station]
+        running = mine[mine["end_time"] >= cut]
+        if len(running):
+            cut = min(cut, running["start_time"].min())
+        cut = cut.floor("D")
+        before = times < cut
+        last_valid = {col: str(times[before & present].iloc[-1]) for col in ["WSPD", "WVHT"]
+                      for present in [valid(rows, [col])] if (before & present).any()}
+        self.state["stations"][station].update(
+            scanned_until=str(end), resume=str(cut), last_valid=last_valid)
+
+    def _scan(self, station, partitions):
+        resume = self._resume_point(station, partitions)
+        cut, context = resume if resume is not None else (None, None)
+        self.state["stations"][station] = {}
+        frames = list(self._chunks(station, context))
+        if not frames:
+            return
+        events = detect_storms(frames, self.wspd_threshold, self.wvht_threshold)
+        # With no storms detect_storms returns object columns; use the catalog's dtypes
+        events = events.drop(columns="storm_group").astype(
+            {"start_time": "datetime64[ns]", "end_time": "datetime64[ns]"})
+        events.insert(0, "station_id", station)
+        events.insert(4, "duration_hours",
+                      (events["end_time"] - events["start_time"]).dt.total_seconds() / 3600)
+        events["wspd_threshold"] = self.wspd_threshold
+        events["wvht_threshold"] = self.wvht_threshold
+        events = events[EVENT_COLUMNS].astype(_empty_events().dtypes.to_dict())
+
+        rows = pd.concat(frames, ignore_index=True)
+        rows = rows[valid(rows, ["WVHT"])]
+        daily = rows.groupby(rows["datetime"].dt.floor("D"))["WVHT"].max().reset_index()
+        daily.columns = ["date", "max_wave_height"]
+        daily.insert(0, "station_id", station)
+
+        keep_events = self.events["station_id"] != station
+        keep_daily = self.daily["station_id"] != station
+        if cut is not None:
+            events = events[events["start_time"] >= cut]
+            daily = daily[daily["date"] >= cut]
+            keep_events |= self.events["start_time"] < cut
+            keep_daily |= self.daily["date"] < cut
+        self.events = pd.concat([self.events[keep_events], events[EVENT_COLUMNS]], ignore_index=True)
+        self.daily = pd.concat([self.daily[keep_daily], daily], ignore_index=True)
+        self._save_resume_point(station, frames)
+
+    def update(self, stations=None):
+        """Fold newly ingested rows into the catalog. Returns the stations rescanned."""
+        partitions = self._station_partitions()
+        selected = sorted(partitions) if stations is None \
+            else [str(s) for s in stations if str(s) in partitions]
+        changed = [s for s in selected
+                   if self.state["stations"].get(s, {}).get("partitions") != partitions[s]]
+        for station in changed:
+            self._scan(station, partitions[station])
+            self.state["stations"][station]["partitions"] = partitions[station]
+        if changed:
+            self.events = self.events.sort_values(["start_time", "station_id"],
+                                                  kind="stable").reset_index(drop=True)
+            self.daily = self.daily.sort_values(["station_id", "date"], kind="stable").reset_index(drop=True)
+            self._build_index()
+            self.save()
+        return changed
+
+    def rebuild(self):
+        self.events = _empty_events()
+        self.daily = _empty_daily()
+        self.state["stations"] = {}
+        return self.update()
+
+    # --- queries ---
+
+    def overlapping(self, start, end, station=None):
+        """Storms overlapping [start, end], in start order."""
+        index = self.index if station is None else self.station_index.get(str(station))
+        if index is None:
+            return self.events.iloc[:0]
+        rows = np.sort(index.overlapping(_ns(start), _ns(end)))
+        return self.events.iloc[rows]
+
+    def top(self, n=5, start=None, end=None, year=None, station=None):
+        """The n most intense storms, optionally overlapping a window or a year."""
+        if year is not None:
+            start, end = pd.Timestamp(year=int(year), month=1, day=1), \
+                pd.Timestamp(year=int(year) + 1, month=1, day=1) - pd.Timedelta(1, "ns")
+        if start is None and end is None:
+            events = self.events if station is None else \
+                self.events[self.events["station_id"] == str(station)]
+        else:
+            events = self.overlapping(start if start is not None else pd.Timestamp.min,
+                                      end if end is not None else pd.Timestamp.max, station)
+        return events.nlargest(n, "intensity_score")
+
+    def significant_days(self, quantile=0.95, stations=None, exact=False):
+        """0054: days whose peak WVHT reaches the station's quantile threshold.
+
+        The threshold comes from the store's WVHT sketches (or the raw
+        partitions with exact=True), so new data moves it without a rescan.
+        """
+        stations = sorted(self.daily["station_id"].unique()) if stations is None \
+            else [str(s) for s in stations]
+        tables = []
+        for station in stations:
+            threshold = self.store.quantile("WVHT", quantile, stations=[station], exact=exact)
+            days = self.daily[(self.daily["station_id"] == station)
+                              & (self.daily["max_wave_height"] >= threshold)]
+            tables.append(days.assign(threshold=threshold))
+        if not tables:
+            return self.daily.assign(threshold=np.nan).iloc[:0]
+        return pd.concat(tables, ignore_index=True)
+
+
+def main():
+    from buoy.store import PartitionedStore
+
+    parser = argparse.ArgumentParser(description="Query the storm catalog of a store")
+    parser.add_argument("store")
+    parser.add_argument("--update", action="store_true", help="fold in newly ingested rows first")
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--wspd", type=float, default=WSPD_THRESHOLD)
+    parser.add_argument("--wvht", type=float, default=WVHT_THRESHOLD)
+    parser.add_argument("--station")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--days", action="store_true", help="list the 0054 significant-storm days")
+    parser.add_argument("--quantile", type=float, default=0.95)
+    args = parser.parse_args()
+
+    catalog = StormCatalog(PartitionedStore(args.store), args.wspd, args.wvht)
+    if args.rebuild:
+        print(f"Rebuilt {len(catalog.rebuild())} stations")
+    elif args.update:
+        print(f"Rescanned {len(catalog.update())} stations")
+    if args.days:
+        days = catalog.significant_days(args.quantile, [args.station] if args.station else None)
+        print(days.to_string(index=False))
+        return
+    table = catalog.top(args.top, args.start, args.end, args.year, args.station)
+    print(f"{len(catalog.events):,} storms catalogued; top {len(table)}:")
+    print(table.drop(columns=["wspd_threshold", "wvht_threshold"]).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""One command for the 0053-0056 analyses.
+
+    python -m buoy storms 0056/all_stations_october_2012.csv --top 5
+    python -m buoy climatology noaa_44025_2019_2024.csv --fill-year 2024
+    python -m buoy sandy 0056/all_stations_october_2012.csv --plot sandy.png
+    python -m buoy forecast store/ --stations 44025
+
+The data argument is a CSV (cached as Feather by buoy.loader), an NDBC
+.txt/.txt.gz file, or a PartitionedStore directory. It is loaded once; the
+exploratory overview the scripts print is only shown with --overview, and
+--compact shrinks the frame with buoy.compact before any command runs.
+matplotlib is imported only when --plot is given and sklearn only for
+`forecast --sklearn`, so text queries start in well under a second.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SANDY_START = "2012-10-22"
+SANDY_END = "2012-10-30 23:59:59"
+SANDY_DATES = ["2012-10-22 12:00", "2012-10-26 12:00", None, "2012-10-30 12:00"]
+CAT5_WSPD = 70.0
+
+
+def load_dataset(path, stations=None, years=None, station=None):
+    """Frame with a datetime column (and station_id) from a CSV, stdmet file or store.
+
+    Sentinels are masked once here (buoy.quality), leaving NaN and a QC column.
+    """
+    from buoy.quality import mask_frame
+    from buoy.timeparse import add_datetime
+
+    if os.path.isdir(path):
+        from buoy.store import PartitionedStore
+
+        df = PartitionedStore(path).read(stations=stations, years=years)
+    elif path.endswith((".txt", ".gz")):
+        from buoy.stdmet import read_stdmet
+
+        df = read_stdmet(path, mask=True)
+    else:
+        from buoy.loader import load_stdmet
+
+        df = load_stdmet(path)
+    if "station_id" not in df.columns:
+        df["station_id"] = station or os.path.basename(path).split("h")[0].split(".")[0]
+    df["station_id"] = df["station_id"].astype(str)
+    if stations is not None and not os.path.isdir(path):
+        df = df[df["station_id"].isin([str(s) for s in stations])]
+    if "QC" not in df.columns:
+        mask_frame(df)
+    valid = add_datetime(df)
+    return df[valid].sort_values(["station_id", "datetime"], kind="stable").reset_index(drop=True)
+
+
+def print_overview(df):
+    """The exploratory preamble of the numbered scripts."""
+    print("=== DATA OVERVIEW ===")
+    print(f"Rows: {df.shape[0]}, Columns: {df.shape[1]}")
+    print("\nFirst 5 rows:")
+    print(df.head())
+    print("\nData types:")
+    print(df.dtypes)
+    print("\nMissing values:")
+    print(df.isnull().sum())
+    print("\nSummary statistics:")
+    print(df.describe(include='all').transpose())
+    print(f"\nDuplicate rows: {df.duplicated().sum()}")
+    print(f"\nDate range: {df['datetime'].min()} to {df['datetime'].max()}\n")
+
+
+def cmd_storms(df, args):
+    from buoy.storms import detect_storms, interpolate_frame, storm_overviews
+
+    tables = []
+    for station, group in df.groupby("station_id", sort=True):
+        events = detect_storms([group], args.wspd, args.wvht)
+        events = events[events["duration"] > 1].nlargest(args.top, "intensity_score")
+        if not len(events):
+            continue
+        # Like 0055, the overview is taken over the time-interpolated readings
+        interpolated = interpolate_frame(group[["datetime", "WSPD", "WVHT"]])
+        overview = storm_overviews(interpolated, events.sort_values("start_time"))
+        overview = overview.merge(events[["storm_group", "max_wspd", "max_wvht", "intensity_score"]],
+                                  on="storm_group")
+        overview.insert(0, "station_id", station)
+        tables.append(overview.sort_values("intensity_score", ascending=False))
+    if not tables:
+        print("No storms found")
+        return
+    table = pd.concat(tables, ignore_index=True)
+    print(f"Top {args.top} storms per station (WSPD > {args.wspd} m/s and WVHT > {args.wvht} m):")
+    print(table[["station_id", "start_time", "end_time", "duration_hours", "max_wspd",
+                 "wspd_mean", "max_wvht", "wvht_mean", "intensity_score"]].to_string(index=False))
+
+    if args.plot:
+        from buoy.plotting import new_figure, save_figure
+
+        fig, ax = new_figure()
+        labels = [f"{s} {t:%Y-%m-%d}" for s, t in zip(table["station_id"], table["start_time"])]
+        x = np.arange(len(table))
+        ax.bar(x - 0.2, table["wspd_mean"], 0.4, label="Mean Wind Speed (m/s)", color="b", alpha=0.7)
+        ax.bar(x + 0.2, table["wvht_mean"], 0.4, label="Mean Wave Height (m)", color="r", alpha=0.7)
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha="right")
+        ax.legend()
+        ax.set_title("Mean Wind Speed and Wave Height of the Top Storms")
+        save_figure(fig, args.plot)
+        print(f"Saved {args.plot}")
+
+
+def cmd_climatology(df, args):
+    from buoy.cube import ClimatologyCube
+
+    cube = ClimatologyCube.from_frame(df)
+    column = args.column
+    pivot = cube.seasonal_pivot(column)
+    print(f"Monthly mean {column} by year:")
+    print(pivot.round(2).to_string())
+    print("\nClimatology (all years):")
+    print(cube.climatology(column).round(2).to_string())
+    monthly = cube.monthly_means(column)
+    if args.fill_year is not None:
+        monthly = cube.fill_year(column, args.fill_year)
+        print(f"\n{args.fill_year} with missing months from earlier years:")
+        print(monthly[["month", column]].round(2).to_string(index=False))
+
+    if args.plot:
+        from buoy.plotting import new_figure, plot_lines, save_figure
+
+        fig, ax = new_figure()
+        series = {year: (pivot.columns.to_numpy(), pivot.loc[year].to_numpy())
+                  for year in pivot.index}
+        plot_lines(ax, series)
+        ax.set_xlabel("Month")
+        ax.set_ylabel(column)
+        ax.set_title(f"Monthly Mean {column} by Year")
+        save_figure(fig, args.plot)
+        print(f"Saved {args.plot}")
+
+
+def sandy_frame(df, max_gap="3h"):
+    """0056 cleaning: the Sandy window (sentinels already NaN), per-station interpolation."""
+    from buoy.interp import interpolate_stations
+
+    window = df[df["datetime"].between(SANDY_START, SANDY_END)]
+    window, _ = interpolate_stations(window, columns=["WSPD", "WVHT"], max_gap=max_gap)
+    window["storm_intensity"] = window["WSPD"] * window["WVHT"]
+    return window.dropna(subset=["storm_intensity"]).reset_index(drop=True)
+
+
+def cmd_sandy(df, args):
+    from buoy.daily import DailyTable
+    from buoy.regression import fit
+    from buoy.stations import load_registry
+
+    window = sandy_frame(df, args.max_gap)
+    if "latitude" not in window.columns:
+        registry = load_registry()
+        coords = {s: registry.location(s) for s in window["station_id"].unique()}
+        window["latitude"] = window["station_id"].map(lambda s: coords[s][0])
+        window["longitude"] = window["station_id"].map(lambda s: coords[s][1])
+    station = window[window["station_id"] == args.station]
+    if station.empty:
+        stations = ", ".join(sorted(window["station_id"].unique()))
+        print(f"No readings for station {args.station} in the Sandy window "
+              f"(stations: {stations or 'none'}); pick one with --station")
+        return 1
+    peak = station.loc[station["storm_intensity"].idxmax()]
+    print(f"Maximum intensity at {args.station}: {peak['storm_intensity']:.2f} "
+          f"on {peak['datetime']} (WSPD {peak['WSPD']:g}, WVHT {peak['WVHT']:g})")
+
+    dates = [pd.Timestamp(d) if d else peak["datetime"] for d in SANDY_DATES]
+    # One grouped pass for every day of the window; each chart is a lookup
+    table = DailyTable(window)
+    date_data = table.days(dates)
+    for date, data in date_data.items():
+        print(f"\nDate: {date}")
+        print(data[["station_id", "WSPD", "WVHT", "storm_intensity"]].round(2).to_string(index=False))
+
+    model = fit(window)
+    cat5_wvht = float(model.predict([CAT5_WSPD])[0])
+    print(f"\nPredicted WVHT (Cat 5, {CAT5_WSPD:g} m/s): {cat5_wvht:.2f} m")
+
+    if args.plot:
+        from buoy.daily import bubble_grid
+        from buoy.plotting import save_figure
+
+        fig = bubble_grid(table, table.dates if args.all_days else dates)
+        save_figure(fig, args.plot)
+        print(f"Saved {args.plot}")
+
+    if args.animate:
+        from buoy.animate import animate
+
+        frames = animate(window, args.animate, step=args.step, fps=args.fps, workers=args.workers)
+        print(f"Saved {args.animate} ({frames} frames)")
+
+
+def cmd_forecast(df, args):
+    from buoy.regression import HURRICANE_WINDS, category_wave_heights, fit
+
+    # fit skips rows with NaN, so no filtered copy is needed
+    model = fit(df)
+    table = category_wave_heights(model)
+    print(f"WVHT = {model.coef_[0]:.4f} * WSPD + {model.intercept_:.4f} "
+          f"(n={model.n:,}, R^2={model.r2():.3f})")
+    if args.sklearn:
+        from buoy.quality import valid
+        from sklearn.linear_model import LinearRegression
+
+        rows = valid(df, ["WSPD", "WVHT"])
+        reference = LinearRegression().fit(df.loc[rows, ["WSPD"]].values, df.loc[rows, "WVHT"].values)
+        table["sklearn WVHT"] = reference.predict(
+            np.array(HURRICANE_WINDS).reshape(-1, 1))
+    print("\nPredicted mean wave heights by hurricane category:")
+    print(table.round(2).to_string(index=False))
+
+    if args.plot:
+        from buoy.plotting import new_figure, save_figure
+
+        fig, ax = new_figure(figsize=(10, 6))
+        ax.bar(table["Hurricane Category"], table["Predicted WVHT"], color="teal", alpha=0.7)
+        ax.set_xlabel("Hurricane Category")
+        ax.set_ylabel("Predicted Wave Height (m)")
+        ax.set_title("Predicted Wave Height by Hurricane Category")
+        save_figure(fig, args.plot)
+        print(f"Saved {args.plot}")
+
+
+COMMANDS = {"storms": cmd_storms, "climatology": cmd_climatology, "sandy": cmd_sandy,
+            "forecast": cmd_forecast}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m buoy", description="NDBC buoy analyses")
+    sub = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("data", help="CSV, NDBC .txt/.txt.gz file or store directory")
+    common.add_argument("--stations", nargs="+", help="only these stations")
+    common.add_argument("--years", type=int, nargs="+", help="only these years (store only)")
+    common.add_argument("--station-id", help="station id for single-station files")
+    common.add_argument("--overview", action="store_true", help="print the exploratory overview")
+    common.add_argument("--compact", action="store_true",
+                        help="downcast the loaded frame and print the bytes saved per column")
+    common.add_argument("--plot", metavar="PNG", help="save the command's figure here")
+    common.add_argument("--trace", metavar="JSON", help="write a stage trace here")
+
+    storms = sub.add_parser("storms", parents=[common], help="strongest storms per station")
+    storms.add_argument("--top", type=int, default=5)
+    storms.add_argument("--wspd", type=float, default=15.0)
+    storms.add_argument("--wvht", type=float, default=2.0)
+
+    climatology = sub.add_parser("climatology", parents=[common], help="monthly means and climatology")
+    climatology.add_argument("--column", default="WVHT")
+    climatology.add_argument("--fill-year", type=int)
+
+    sandy = sub.add_parser("sandy", parents=[common], help="Hurricane Sandy storm intensity (0056)")
+    sandy.add_argument("--station", default="44009", help="station whose peak picks the key date")
+    sandy.add_argument("--max-gap", default="3h")
+    sandy.add_argument("--all-days", action="store_true",
+                       help="plot a bubble chart for every day of the window, not just the four")
+    sandy.add_argument("--animate", metavar="GIF_OR_MP4", help="render a bubble map per time step")
+    sandy.add_argument("--step", default="1h", help="animation time step (e.g. 10min, 1h)")
+    sandy.add_argument("--fps", type=int, default=12)
+    sandy.add_argument("--workers", type=int, help="frame-rendering processes (default: all CPUs)")
+
+    forecast = sub.add_parser("forecast", parents=[common], help="WVHT per hurricane category")
+    forecast.add_argument("--sklearn", action="store_true", help="also fit with sklearn to compare")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    tracer = None
+    if args.trace:
+        from buoy.trace import Tracer
+
+        tracer = Tracer()
+    stage = tracer.stage if tracer else None
+
+    def run(name, func, *func_args):
+        if stage is None:
+            return func(*func_args)
+        with stage(name):
+            return func(*func_args)
+
+    df = run("load", load_dataset, args.data, args.stations, args.years, args.station_id)
+    if df.empty:
+        print(f"No rows in {args.data}")
+        return 1
+    if args.compact:
+        from buoy.compact import compact, format_report
+
+        df, report = run("compact", compact, df)
+        print(format_report(report) + "\n")
+    if args.overview:
+        run("overview", print_overview, df)
+    status = run(args.command, COMMANDS[args.command], df, args)
+    if tracer:
+        tracer.save(args.trace)
+    return status or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Shrink loaded buoy frames to the narrowest dtypes their columns need.
+
+Every stdmet column has a fixed range, so the target dtypes come from a
+schema rather than from inspecting the data: uint16 for years and the
+direction columns, uint8 for month/day/hour/minute, float32 for the
+measurements (about 7 significant digits against the 1-2 decimals NDBC
+reports; the 99/999/9999 sentinels stay exact), and a categorical
+station_id. Once a `datetime` column exists the YY/MM/DD/hh/mm parts are
+redundant and are dropped.
+
+    df, report = compact(df)
+    print(format_report(report))
+
+A decade of 10-minute readings from 50 stations is about 26M rows: some
+5.6 GB with object station ids and 64-bit columns (230 bytes a row), about
+1.6 GB compacted (65 bytes a row, with latitude/longitude).
+"""
+import numpy as np
+import pandas as pd
+
+TIME_PARTS = ["YY", "Year", "MM", "DD", "hh", "mm"]
+SCHEMA = {
+    "YY": "uint16", "Year": "uint16", "MM": "uint8", "DD": "uint8", "hh": "uint8", "mm": "uint8",
+    "WDIR": "uint16", "MWD": "uint16",
+    "WSPD": "float32", "GST": "float32", "WVHT": "float32", "DPD": "float32", "APD": "float32",
+    "PRES": "float32", "ATMP": "float32", "WTMP": "float32", "DEWP": "float32",
+    "VIS": "float32", "TIDE": "float32",
+    "latitude": "float32", "longitude": "float32",
+    "QC": "uint16", "station_id": "category",
+}
+
+
+def _fits(values, dtype):
+    """True if every value of an integer or float column casts losslessly to dtype."""
+    info = np.iinfo(dtype)
+    if values.dtype.kind == "f":
+        if np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+            return False
+    return len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)
+
+
+def target_dtype(series, dtype):
+    """The schema dtype, or float32 for an integer column that no longer fits it."""
+    if dtype == "category":
+        return dtype
+    kind = np.dtype(dtype).kind
+    if kind in "ui" and pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy()
+        if not _fits(values, dtype):
+            # e.g. WDIR after sentinel masking holds NaN
+            return "float32" if values.dtype.kind == "f" else series.dtype
+    return dtype
+
+
+def compact(df, drop_time_parts=True, schema=None):
+    """Return (compacted frame, report) for a stdmet-style frame.
+
+    The report has one row per original column with its dtype and bytes
+    before and after (0 after for dropped columns). Columns not in the
+    schema are left as they are.
+    """
+    schema = SCHEMA if schema is None else schema
+    before = df.memory_usage(deep=True, index=False)
+    dtypes_before = df.dtypes.astype(str)
+    drop = []
+    if drop_time_parts and "datetime" in df.columns:
+        drop = [c for c in TIME_PARTS if c in df.columns]
+
+    columns = {}
+    for col in df.columns:
+        if col in drop:
+            continue
+        series = df[col]
+        if col in schema:
+            dtype = target_dtype(series, schema[col])
+            if str(series.dtype) != str(dtype):
+                series = series.astype(dtype)
+        columns[col] = series
+    out = pd.DataFrame(columns, index=df.index)
+
+    after = out.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "column": list(df.columns),
+        "dtype_before": [dtypes_before[c] for c in df.columns],
+        "dtype_after": [str(out[c].dtype) if c in out.columns else "dropped" for c in df.columns],
+        "bytes_before": [int(before[c]) for c in df.columns],
+        "bytes_after": [int(after[c]) if c in out.columns else 0 for c in df.columns],
+    })
+    report["saved"] = report["bytes_before"] - report["bytes_after"]
+    return out, report
+
+
+def format_report(report):
+    total_before = report["bytes_before"].sum()
+    total_after = report["bytes_after"].sum()
+    lines = [f"{'column':<12} {'before':>14} {'after':>14} {'MB before':>10} {'MB after':>9} {'saved':>8}"]
+    for row in report.itertuples(index=False):
+        lines.append(f"{row.column:<12} {row.dtype_before:>14} {row.dtype_after:>14} "
+                     f"{row.bytes_before / 2 ** 20:>10.2f} {row.bytes_after / 2 ** 20:>9.2f} "
+                     f"{row.saved / 2 ** 20:>8.2f}")
+    ratio = total_after / total_before if total_before else 1.0
+    lines.append(f"{'total':<42} {total_before / 2 ** 20:>10.2f} {total_after / 2 ** 20:>9.2f} "
+                 f"{(total_before - total_after) / 2 ** 20:>8.2f}  ({ratio:.0%} of the original)")
+    return "\n".join(lines)
@@ -0,0 +1,144 @@
+"""Station x year x month climatology cube for the 0053 seasonal analyses.
+
+For every numeric column the cube keeps sum, count, min, max and sum of squares
+per (station_id, year, month). Those combine by addition (and min/max), so new
+rows are folded in without touching earlier data, and monthly means, seasonal
+pivots and the 0053 gap-fill are answered from a table of a few hundred rows.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from buoy.quality import missing
+
+KEYS = ["station_id", "year", "month"]
+STATS = ["sum", "count", "min", "max", "sumsq"]
+MEASUREMENTS = ["WDIR", "WSPD", "GST", "WVHT", "DPD", "APD", "MWD", "PRES",
+                "ATMP", "WTMP", "DEWP", "VIS", "TIDE"]
+
+MERGE_AGG = {"sum": "sum", "count": "sum", "min": "min", "max": "max", "sumsq": "sum"}
+
+
+def partial_cube(df, station, columns=None):
+    """Aggregate raw rows of one station into cube rows."""
+    columns = [c for c in (columns or MEASUREMENTS) if c in df.columns]
+    if "MM" in df.columns:
+        year_col = "YY" if "YY" in df.columns else "Year"
+        year = df[year_col].to_numpy().astype(np.int64)
+        month = df["MM"].to_numpy().astype(np.int64)
+    else:
+        # Compacted frames (buoy.compact) keep only the datetime column
+        year = df["datetime"].dt.year.to_numpy().astype(np.int64)
+        month = df["datetime"].dt.month.to_numpy().astype(np.int64)
+    groups, inverse = np.unique(year * 100 + month, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.searchsorted(inverse[order], np.arange(len(groups)))
+
+    # A few array passes per column (bincount for sums, reduceat over the
+    # month-sorted rows for min/max) instead of five groupbys per column
+    parts = {"year": groups // 100, "month": groups % 100}
+    for col in columns:
+        values = df[col].to_numpy(dtype=np.float64)
+        # Each column against its own sentinel (PRES 9999, not a real 999 hPa)
+        valid = ~missing(values, col)
+        values = np.where(valid, values, np.nan)
+        filled = np.where(valid, values, 0.0)
+        parts[f"{col}_sum"] = np.bincount(inverse, weights=filled, minlength=len(groups))
+        parts[f"{col}_count"] = np.bincount(inverse[valid], minlength=len(groups)).astype(np.int64)
+        parts[f"{col}_min"] = np.fmin.reduceat(values[order], starts) if len(values) else []
+        parts[f"{col}_max"] = np.fmax.reduceat(values[order], starts) if len(values) else []
+        parts[f"{col}_sumsq"] = np.bincount(inverse, weights=filled * filled, minlength=len(groups))
+    cube = pd.DataFrame(parts)
+    cube.insert(0, "station_id", str(station))
+    return cube
+
+
+def merge_cubes(*cubes):
+    cubes = [c for c in cubes if c is not None and len(c)]
+    if not cubes:
+        return None
+    combined = pd.concat(cubes, ignore_index=True)
+    agg = {name: MERGE_AGG[name.rsplit("_", 1)[1]] for name in combined.columns if name not in KEYS}
+    return combined.groupby(KEYS, as_index=False).agg(agg)
+
+
+class ClimatologyCube:
+    def __init__(self, path=None):
+        self.path = path
+        self.table = None
+        if path and os.path.exists(path):
+            self.table = pd.read_feather(path)
+
+    @classmethod
+    def from_frame(cls, df, by="station_id", path=None):
+        """Cube of a multi-station frame, merged once rather than station by station."""
+        cube = cls(path)
+        cube.table = merge_cubes(cube.table, *(partial_cube(group, station)
+                                               for station, group in df.groupby(by, sort=True)))
+        if path:
+            cube.table.to_feather(path)
+        return cube
+
+    def add(self, df, station):
+        """Fold new raw rows for a station into the cube (and save it if persisted)."""
+        self.table = merge_cubes(self.table, partial_cube(df, station))
+        if self.path:
+            self.table.to_feather(self.path)
+        return self
+
+    def select(self, stations=None, years=None):
+        table = self.table
+        if stations is not None:
+            table = table[table["station_id"].isin([str(s) for s in stations])]
+        if years is not None:
+            table = table[table["year"].isin(list(years))]
+        return table
+
+    def monthly(self, column, stations=None, years=None):
+        """year, month, mean, std, min, max, count of a column, pooled over stations."""
+        cols = [f"{column}_{stat}" for stat in STATS]
+        table = self.select(stations, years)[["year", "month"] + cols]
+        table = table.groupby(["year", "month"], as_index=False).agg(
+            {c: MERGE_AGG[c.rsplit("_", 1)[1]] for c in cols})
+        table = table[table[f"{column}_count"] > 0]
+        n = table[f"{column}_count"]
+        mean = table[f"{column}_sum"] / n
+        var = (table[f"{column}_sumsq"] / n - mean ** 2).clip(lower=0) * n / (n - 1)
+        return pd.DataFrame({
+            "year": table["year"].to_numpy(), "month": table["month"].to_numpy(),
+            "mean": mean.to_numpy(), "std": np.sqrt(var).to_numpy(),
+            "min": table[f"{column}_min"].to_numpy(), "max": table[f"{column}_max"].to_numpy(),
+            "count": n.to_numpy(),
+        })
+
+    def monthly_means(self, column, stations=None, years=None):
+        """Same shape as the 0053 monthly_wvht frame: year, month, <column>, date."""
+        monthly = self.monthly(column, stations, years)
+        out = monthly[["year", "month"]].assign(**{column: monthly["mean"]})
+        out["date"] = pd.to_datetime(out[["year", "month"]].assign(day=1))
+        return out
+
+    def seasonal_pivot(self, column, stations=None):
+        """Mean of a column with years as rows and months as columns."""
+        monthly = self.monthly(column, stations)
+        return monthly.pivot(index="year", columns="month", values="mean")
+
+    def climatology(self, column, stations=None, before_year=None):
+        """Average of the monthly means per calendar month (0053's historical_avg)."""
+        monthly = self.monthly(column, stations)
+        if before_year is not None:
+            monthly = monthly[monthly["year"] < before_year]
+        return monthly.groupby("month")["mean"].mean()
+
+    def fill_year(self, column, year, stations=None):
+        """Monthly means for a year with missing months taken from earlier years."""
+        historical = self.climatology(column, stations, before_year=year)
+        present = self.monthly_means(column, stations, years=[year])
+        missing = sorted(set(historical.index) - set(present["month"]))
+        # int64 even when empty, or the concat turns year and month into floats
+        filled = pd.DataFrame({"year": np.full(len(missing), year, dtype=np.int64),
+                               "month": np.array(missing, dtype=np.int64),
+                               column: [historical.loc[m] for m in missing]})
+        filled["date"] = pd.to_datetime(filled[["year", "month"]].assign(day=1))
+        return pd.concat([present, filled]).sort_values("date").reset_index(drop=True)
@@ -0,0 +1,139 @@
+"""Named analysis stages with declared inputs, run once each as a DAG.
+
+    pipeline = Pipeline()
+
+    @pipeline.stage()
+    def raw(path):                      # parameters come from run(params=...)
+        return load_stdmet(path)
+
+    @pipeline.stage(inputs=["raw"])
+    def clean(raw, sentinel=99.0):
+        ...
+
+    results = pipeline.run(["storm_plot", "category_plot"], params={"path": ...}, workers=2)
+
+A stage's arguments are the results of the stages named in `inputs`, followed
+by any of its keyword parameters found in `params`. `run` executes only the
+stages the targets depend on, each exactly once however many targets share
+it, and keeps results so later calls reuse them. With workers > 1, stages
+whose inputs are ready run concurrently on a thread pool, so independent
+branches (e.g. two plots of the same table) overlap.
+"""
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Stage:
+    def __init__(self, name, func, inputs=()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        parameters = inspect.signature(func).parameters
+        self.param_names = [p for p in parameters][len(self.inputs):]
+
+    def __call__(self, results, params):
+        args = [results[name] for name in self.inputs]
+        return self.func(*args, **self.params(params))
+
+    def params(self, params):
+        """The subset of params this stage is called with."""
+        return {k: params[k] for k in self.param_names if k in params}
+
+
+class Pipeline:
+    def __init__(self):
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+        self._params = {}
+
+    def add(self, name, func, inputs=()):
+        if name in self.stages:
+            raise ValueError(f"Stage {name!r} is already defined")
+        self.stages[name] = Stage(name, func, inputs)
+        return func
+
+    def stage(self, name=None, inputs=()):
+        """Decorator registering a function as a stage (named after it by default)."""
+        def decorate(func):
+            return self.add(name or func.__name__, func, inputs)
+        return decorate
+
+    def dependencies(self, targets):
+        """Stages needed for targets, in a valid execution order."""
+        order, state = [], {}
+
+        def visit(name, path):
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage {name!r}" + (f" (needed by {path[-1]!r})" if path else ""))
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError("Stage cycle: " + " -> ".join(path + [name]))
+            state[name] = "visiting"
+            for dep in self.stages[name].inputs:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for target in targets:
+            visit(target, [])
+        return order
+
+    def invalidate(self, names=None):
+        """Forget results of the given stages (all if None) and everything downstream."""
+        if names is None:
+            self.results.clear()
+            return
+        stale = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in stale and stale.intersection(stage.inputs):
+                    stale.add(stage.name)
+                    changed = True
+        for name in stale:
+            self.results.pop(name, None)
+
+    def run(self, targets, params=None, workers=1):
+        """Run what targets need and return {target: result}.
+
+        Changing params between runs discards only the results of stages that
+        take a changed parameter, and of everything downstream of them.
+        """
+        targets = [targets] if isinstance(targets, str) else list(targets)
+        params = dict(params or {})
+        if params != self._params:
+            self.invalidate([stage.name for stage in self.stages.values()
+                             if stage.params(params) != stage.params(self._params)])
+            self._params = params
+        order = [name for name in self.dependencies(targets) if name not in self.results]
+        if workers <= 1:
+            for name in order:
+                self._run_stage(name, params)
+        else:
+            self._run_parallel(order, params, workers)
+        return {name: self.results[name] for name in targets}
+
+    def _run_stage(self, name, params):
+        start = time.perf_counter()
+        self.results[name] = self.stages[name](self.results, params)
+        self.timings[name] = time.perf_counter() - start
+        return name
+
+    def _run_parallel(self, order, params, workers):
+        pending = set(order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                ready = [name for name in order if name in pending
+                         and all(dep in self.results for dep in self.stages[name].inputs)]
+                for name in ready:
+                    pending.discard(name)
+                    running[pool.submit(self._run_stage, name, params)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    future.result()  # re-raise a failed stage here
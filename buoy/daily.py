@@ -0,0 +1,87 @@
+"""Per-day, per-station aggregates for the 0056 Sandy bubble charts.
+
+0056 builds each bubble chart by scanning the whole window for one date
+(`df_filtered['datetime'].dt.date == date.date()`) and grouping what it
+finds, so every chart is another full pass. `DailyTable` does one grouped
+pass over the window for every day at once, keeping the mean, max and
+count of each value per date and station, with the station's coordinates.
+A chart is then a slice of the table found by binary search:
+
+    table = DailyTable(window)
+    table.day("2012-10-29")          # same rows as the 0056 date_df
+    fig = bubble_grid(table, table.dates)
+
+bubble_grid draws any number of days as panels of one figure, so a month
+of charts costs one render rather than one per day.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+VALUES = ["WSPD", "WVHT", "storm_intensity"]
+KEYS = ["station_id", "latitude", "longitude"]
+
+
+class DailyTable:
+    def __init__(self, window, values=VALUES, time="datetime"):
+        self.values = list(values)
+        day = window[time].dt.floor("D").rename("date")
+        grouped = window.groupby([day, window["station_id"]], sort=True)[self.values]
+        table = grouped.agg(["mean", "max", "count"])
+        # The means keep the plain column names the scripts use
+        table.columns = [col if stat == "mean" else f"{col}_{stat}" for col, stat in table.columns]
+        columns = ["date"] + KEYS + list(table.columns)
+        # Coordinates are joined afterwards rather than grouped on, so a station
+        # whose location is unknown (NaN) keeps its rows
+        coords = window.groupby("station_id", sort=False)[KEYS[1:]].first()
+        self.table = table.reset_index().join(coords, on="station_id")[columns]
+        self._dates = self.table["date"].to_numpy()
+
+    @property
+    def dates(self):
+        return list(pd.DatetimeIndex(np.unique(self._dates)))
+
+    def day(self, date):
+        """Station rows for one calendar day (empty if the day has no data)."""
+        day = np.datetime64(pd.Timestamp(date).floor("D").as_unit("ns"))
+        lo = np.searchsorted(self._dates, day, side="left")
+        hi = np.searchsorted(self._dates, day, side="right")
+        return self.table.iloc[lo:hi].drop(columns="date").reset_index(drop=True)
+
+    def days(self, dates):
+        """{"YYYY-MM-DD": day(date)} in the order given, like 0056's date_data."""
+        return {pd.Timestamp(d).strftime("%Y-%m-%d"): self.day(d) for d in dates}
+
+
+def draw_bubbles(ax, data, title, scale=10):
+    ax.scatter(data["longitude"], data["latitude"], s=data["storm_intensity"] * scale, alpha=0.5)
+    # Plain text is cheaper to draw than annotate() and looks the same here
+    for row in data.itertuples(index=False):
+        ax.text(row.longitude, row.latitude, str(row.station_id))
+    ax.set_title(title)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+
+
+def bubble_grid(table, dates, ncols=None, panel_size=(7.5, 5), scale=10):
+    """One figure with a bubble chart per date (2 x 2 for the four 0056 dates).
+
+    Stations do not move, so the panels share their axes and only the outer
+    ones draw tick labels; most of the cost of a large grid is text.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    dates = list(dates)
+    ncols = ncols or (2 if len(dates) <= 4 else math.ceil(math.sqrt(len(dates))))
+    nrows = math.ceil(len(dates) / ncols)
+    fig = Figure(figsize=(panel_size[0] * ncols, panel_size[1] * nrows))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows, ncols, squeeze=False, sharex=True, sharey=True).ravel()
+    for ax, (date, data) in zip(axes, table.days(dates).items()):
+        draw_bubbles(ax, data, f"Storm Intensity - {date}", scale)
+        ax.label_outer()
+    for ax in axes[len(dates):]:
+        ax.set_visible(False)
+    return fig
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+NDBC_BASE_URL = "https://www.ndbc.noaa.gov"
+STDMET_PATH = "/data/historical/stdmet/{station}h{year}.txt.gz"
+
+# Statuses worth retrying; a 404 just means the station has no file that year
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 1 << 16
+
+
+def stdmet_filename(station, year):
+    return f"{station}h{year}.txt.gz"
+
+
+def make_session(pool_size=16, retries=4, backoff=0.5):
+    """Session with keep-alive pooling and exponential backoff on transient errors."""
+    retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                  backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=["GET"], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class HostLimiter:
+    """Caps the number of in-flight requests per host."""
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def get(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self.semaphores[host]
+
+
+def download_file(session, url, path, timeout=30):
+    """Stream a URL to path via a temporary file. Returns bytes written.
+
+    A failed transfer leaves neither path nor the temporary file behind.
+    """
+    tmp_path = path + ".part"
+    written = 0
+    try:
+        with session.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+def fetch_stdmet(jobs, dest_dir, base_url=NDBC_BASE_URL, max_workers=16, per_host=6,
+                 retries=4, backoff=0.5, timeout=30, overwrite=False):
+    """Download stdmet files for (station, year) jobs into dest_dir concurrently.
+
+    Files that already exist are skipped unless overwrite is set. Returns a list of
+    dicts with station, year, path (None on failure), bytes and error.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    session = make_session(pool_size=max_workers, retries=retries, backoff=backoff)
+    limiter = HostLimiter(per_host)
+
+    def fetch_one(station, year):
+        path = os.path.join(dest_dir, stdmet_filename(station, year))
+        result = {"station": station, "year": year, "path": path, "bytes": 0, "error": None}
+        if not overwrite and os.path.exists(path) and os.path.getsize(path) > 0:
+            return result
+        url = base_url.rstrip("/") + STDMET_PATH.format(station=station, year=year)
+        try:
+            with limiter.get(url):
+                result["bytes"] = download_file(session, url, path, timeout=timeout)
+        except (requests.RequestException, OSError) as e:
+            # A disk error (full, permissions) fails this job, not the whole batch
+            result["path"] = None
+            result["error"] = str(e)
+        return result
+
+    # Results come back in job order regardless of completion order
+    with session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(fetch_one, station, year) for station, year in jobs]
+        return [future.result() for future in futures]
+
+
+def summarize(results, elapsed):
+    ok = [r for r in results if r["path"]]
+    total = sum(r["bytes"] for r in results)
+    print(f"Fetched {len(ok)}/{len(results)} files, {total / 1e6:.1f} MB in {elapsed:.2f}s")
+    for r in results:
+        if r["error"]:
+            print(f"Failed to download data for station {r['station']} {r['year']}: {r['error']}")
+
+
+def timed_fetch(jobs, dest_dir, **kwargs):
+    start = time.perf_counter()
+    results = fetch_stdmet(jobs, dest_dir, **kwargs)
+    summarize(results, time.perf_counter() - start)
+    return results
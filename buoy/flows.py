@@ -0,0 +1,161 @@
+"""The 0053 and 0055 report chains expressed as buoy.dag stages.
+
+`storm_report_pipeline()` is 0055/0006.py: load (sentinels masked once, by
+buoy.quality), datetime, time interpolation, storm events, top 5 storm overviews, and two independent
+branches at the end (the top-5 bar chart and the hurricane-category chart).
+`climatology_pipeline()` is the 0053 monthly WVHT chain. The stages call the
+shared implementations (`storms.detect_storms`, `reports.monthly_wvht`,
+`ClimatologyCube.fill_year`) rather than restating them. The scripts run
+these chains twice (exploratory half, then final half); as stages each step
+runs once and both halves share the result.
+
+    results = storm_report_pipeline().run(["storm_plot", "category_plot"],
+                                          params={"path": "noaa_44025_2019_2024.csv",
+                                                  "plot_dir": "plots"}, workers=2)
+"""
+import os
+
+import numpy as np
+
+from buoy.dag import Pipeline
+
+
+def _common_stages(pipeline):
+    @pipeline.stage()
+    def raw(path):
+        from buoy.loader import load_stdmet
+        from buoy.quality import mask_frame
+
+        return mask_frame(load_stdmet(path))
+
+    @pipeline.stage(inputs=["raw"])
+    def timed(raw):
+        from buoy.timeparse import add_datetime
+
+        df = raw.copy()
+        add_datetime(df)
+        return df
+
+
+def storm_report_pipeline():
+    pipeline = Pipeline()
+    _common_stages(pipeline)
+
+    @pipeline.stage(inputs=["timed"])
+    def interpolated(timed):
+        from buoy.storms import interpolate_frame
+
+        return interpolate_frame(timed)
+
+    @pipeline.stage(inputs=["timed"])
+    def storm_events(timed, wspd_threshold=15.0, wvht_threshold=2.0):
+        from buoy.storms import detect_storms
+
+        return detect_storms([timed[["datetime", "WSPD", "WVHT"]]], wspd_threshold, wvht_threshold)
+
+    @pipeline.stage(inputs=["storm_events"])
+    def top_storms(storm_events, top=5):
+        return storm_events[storm_events["duration"] > 1].nlargest(top, "intensity_score")
+
+    @pipeline.stage(inputs=["interpolated", "top_storms"])
+    def storm_overviews(interpolated, top_storms):
+        from buoy import storms
+
+        return storms.overview_dicts(storms.storm_overviews(interpolated, top_storms), top_storms)
+
+    @pipeline.stage(inputs=["interpolated"])
+    def wave_model(interpolated):
+        from buoy.regression import fit
+
+        return fit(interpolated.dropna(subset=["WSPD", "WVHT"]))
+
+    @pipeline.stage(inputs=["wave_model"])
+    def category_wave_heights(wave_model):
+        from buoy.regression import category_wave_heights
+
+        return category_wave_heights(wave_model)
+
+    @pipeline.stage(inputs=["storm_overviews"])
+    def storm_plot(storm_overviews, plot_dir="."):
+        from buoy.plotting import new_figure, save_figure
+
+        fig, ax1 = new_figure()
+        ax2 = ax1.twinx()
+        x = np.arange(len(storm_overviews))
+        ax1.bar(x - 0.2, [s['Mean Wind Speed (m/s)'] for s in storm_overviews], 0.4,
+                label='Mean Wind Speed (m/s)', color='b', alpha=0.7)
+        ax2.bar(x + 0.2, [s['Mean Wave Height (m)'] for s in storm_overviews], 0.4,
+                label='Mean Wave Height (m)', color='r', alpha=0.7)
+        ax1.set_xticks(x)
+        ax1.set_xticklabels([s['Start Time'].date() for s in storm_overviews], rotation=45)
+        ax1.set_xlabel('Storm Date')
+        ax1.set_ylabel('Wind Speed (m/s)', color='b')
+        ax2.set_ylabel('Wave Height (m)', color='r')
+        ax1.legend(loc='upper left')
+        ax2.legend(loc='upper right')
+        ax1.set_title('Side-by-Side Bar Chart of Wind Speed and Wave Height for Top 5 Storms')
+        path = os.path.join(plot_dir, "top_storms.png")
+        save_figure(fig, path)
+        return path
+
+    @pipeline.stage(inputs=["category_wave_heights"])
+    def category_plot(category_wave_heights, plot_dir="."):
+        from buoy.plotting import new_figure, save_figure
+
+        fig, ax = new_figure(figsize=(10, 6))
+        ax.bar(category_wave_heights['Hurricane Category'], category_wave_heights['Predicted WVHT'],
+               color='teal', alpha=0.7)
+        ax.set_xlabel('Hurricane Category')
+        ax.set_ylabel('Predicted Wave Height (m)')
+        ax.set_title('Predicted Wave Height by Hurricane Category Based on Wind Speed-Wave Height Regression')
+        path = os.path.join(plot_dir, "hurricane_categories.png")
+        save_figure(fig, path)
+        return path
+
+    return pipeline
+
+
+def climatology_pipeline():
+    pipeline = Pipeline()
+    _common_stages(pipeline)
+
+    @pipeline.stage()
+    def monthly_wvht(path):
+        from buoy import reports
+
+        return reports.monthly_wvht(path)
+
+    @pipeline.stage(inputs=["monthly_wvht"])
+    def seasonal_pivot(monthly_wvht):
+        return monthly_wvht.pivot(index="year", columns="month", values="WVHT")
+
+    @pipeline.stage(inputs=["timed"])
+    def cube(timed):
+        from buoy.cube import ClimatologyCube
+
+        if "station_id" in timed.columns:
+            return ClimatologyCube.from_frame(timed)
+        return ClimatologyCube().add(timed, "station")
+
+    @pipeline.stage(inputs=["cube"])
+    def complete_year(cube, fill_year=2024):
+        return cube.fill_year("WVHT", fill_year)
+
+    @pipeline.stage(inputs=["seasonal_pivot", "complete_year"])
+    def climatology_plot(seasonal_pivot, complete_year, plot_dir="."):
+        from buoy.plotting import new_figure, plot_lines, save_figure
+
+        fig, ax = new_figure()
+        series = {year: (seasonal_pivot.columns.to_numpy(), seasonal_pivot.loc[year].to_numpy())
+                  for year in seasonal_pivot.index}
+        year = int(complete_year["year"].iloc[0])
+        series[f"{year} (filled)"] = (complete_year["month"].to_numpy(), complete_year["WVHT"].to_numpy())
+        plot_lines(ax, series)
+        ax.set_xlabel("Month")
+        ax.set_ylabel("Mean Wave Height (m)")
+        ax.set_title("Monthly Mean Wave Height by Year")
+        path = os.path.join(plot_dir, "monthly_wvht.png")
+        save_figure(fig, path)
+        return path
+
+    return pipeline
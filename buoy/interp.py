@@ -0,0 +1,82 @@
+"""Station-aware, gap-limited time interpolation.
+
+0056 calls `df_filtered.interpolate()` on rows from four stations, so values
+leak from one station into the next, and 0055 interpolates gaps of any length.
+`interpolate_stations` fills every numeric column in one vectorized pass:
+
+- values are only interpolated between two readings of the same station;
+- a gap is filled only if the two readings around it are at most `max_gap` apart;
+- leading and trailing gaps are left as NaN (nothing to interpolate between).
+
+It returns the filled frame and a boolean frame marking the filled cells.
+"""
+import numpy as np
+import pandas as pd
+
+# Columns that identify a row rather than measure something
+NON_MEASUREMENTS = ["YY", "Year", "MM", "DD", "hh", "mm", "station_id", "latitude", "longitude", "QC"]
+
+
+def measurement_columns(df, time="datetime", by="station_id"):
+    """Numeric columns other than the time parts, station and location."""
+    skip = set(NON_MEASUREMENTS) | {time, by}
+    return [col for col in df.columns if col not in skip and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def interpolate_stations(df, columns=None, by="station_id", time="datetime", max_gap="3h"):
+    """Interpolate columns linearly in time within each station, up to max_gap.
+
+    max_gap is the longest allowed distance between the valid readings on either
+    side of a gap (None for no limit). by may be None for single-station frames.
+    """
+    columns = columns or measurement_columns(df, time, by)
+    n = len(df)
+    if n == 0 or not columns:
+        return df.copy(), pd.DataFrame(False, index=df.index, columns=columns)
+
+    times = df[time].to_numpy().astype("datetime64[ns]").view("i8")
+    groups = (pd.factorize(df[by])[0] if by is not None else np.zeros(n, dtype=np.int64))
+    # Frames usually arrive sorted by station and time; only sort when they don't
+    in_order = bool(np.all((groups[1:] > groups[:-1])
+                           | ((groups[1:] == groups[:-1]) & (times[1:] >= times[:-1]))))
+    order = None if in_order else np.lexsort((times, groups))
+    t = times if in_order else times[order]
+    g = groups if in_order else groups[order]
+    limit = None if max_gap is None else pd.Timedelta(max_gap).value
+    rows = np.arange(n)
+
+    # The sort, group ids and times are shared; each column is then a few 1-D
+    # array operations, with the gathers limited to the missing rows
+    out = df.copy()
+    mask = pd.DataFrame(index=df.index)
+    for col in columns:
+        y = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        if order is not None:
+            y = y[order]
+        valid = ~np.isnan(y)
+        # Nearest valid row at or before / at or after each row
+        prev = np.maximum.accumulate(np.where(valid, rows, -1))
+        nxt = np.minimum.accumulate(np.where(valid, rows, n)[::-1])[::-1]
+
+        gaps = np.flatnonzero(~valid)
+        p, q = prev[gaps], nxt[gaps]
+        ok = (p >= 0) & (q < n)
+        gaps, p, q = gaps[ok], p[ok], q[ok]
+        ok = (g[p] == g[gaps]) & (g[q] == g[gaps])
+        if limit is not None:
+            ok &= (t[q] - t[p]) <= limit
+        gaps, p, q = gaps[ok], p[ok], q[ok]
+
+        filled = y.copy()
+        frac = (t[gaps] - t[p]) / (t[q] - t[p])
+        filled[gaps] = y[p] + (y[q] - y[p]) * frac
+        fill = np.zeros(n, dtype=bool)
+        fill[gaps] = True
+
+        if order is not None:
+            # Back to the caller's row order
+            filled[order] = filled.copy()
+            fill[order] = fill.copy()
+        out[col] = filled
+        mask[col] = fill
+    return out, mask
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# NDBC standard meteorological (stdmet) columns
+COLUMNS = [
+    "YY", "MM", "DD", "hh", "mm", "WDIR", "WSPD", "GST", "WVHT", "DPD", "APD", "MWD",
+    "PRES", "ATMP", "WTMP", "DEWP", "VIS", "TIDE"
+]
+
+# Explicit dtypes so pandas never has to sniff the columns
+DTYPES = {
+    "Year": "int16", "YY": "int16", "MM": "int8", "DD": "int8", "hh": "int8", "mm": "int8",
+    "WDIR": "int16", "MWD": "int16",
+    "WSPD": "float64", "GST": "float64", "WVHT": "float64", "DPD": "float64",
+    "APD": "float64", "PRES": "float64", "ATMP": "float64", "WTMP": "float64",
+    "DEWP": "float64", "VIS": "float64", "TIDE": "float64",
+    "latitude": "float64", "longitude": "float64",
+}
+# station_id is left to pandas: the 0056 scripts compare it against ints
+
+SIDECAR_SUFFIX = ".feather"
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(path):
+    """Return the sha1 of a file, read in 1 MiB chunks."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_stdmet_csv(path):
+    """Parse a buoy CSV with explicit dtypes for every known column."""
+    header = pd.read_csv(path, nrows=0).columns
+    dtype = {col: DTYPES[col] for col in header if col in DTYPES}
+    return pd.read_csv(path, dtype=dtype, engine="c")
+
+
+def sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def _sidecar_is_fresh(path, stat):
+    meta_path = sidecar_path(path) + ".json"
+    if not (os.path.exists(sidecar_path(path)) and os.path.exists(meta_path)):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get("size") != stat.st_size:
+        return False
+    if meta.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    # Same size but touched: only trust the sidecar if the contents still match
+    if meta.get("sha1") == file_hash(path):
+        meta["mtime_ns"] = stat.st_mtime_ns
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+        return True
+    return False
+
+
+def _write_sidecar(path, stat, df):
+    # Uncompressed so later reads can memory-map the file instead of decompressing it
+    feather.write_feather(df, sidecar_path(path), compression="uncompressed")
+    meta = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": file_hash(path)}
+    with open(sidecar_path(path) + ".json", "w") as f:
+        json.dump(meta, f)
+
+
+def load_stdmet(path, use_cache=True):
+    """Load a buoy CSV, using a Feather sidecar next to it when one is up to date.
+
+    The sidecar is keyed by the source file's size, mtime and sha1, so editing
+    the CSV forces a re-parse. Frames are not kept in memory between calls:
+    a reload is a fast Feather read (memory-mapped, no parsing), but
+    to_pandas() still copies every column into the new frame, so each call
+    costs one full copy of the data, and holding one across calls would
+    double the peak memory of every caller.
+    """
+    stat = os.stat(path)
+    if use_cache and feather is not None and _sidecar_is_fresh(path, stat):
+        df = feather.read_table(sidecar_path(path), memory_map=True).to_pandas()
+    else:
+        df = read_stdmet_csv(path)
+        if use_cache and feather is not None:
+            try:
+                _write_sidecar(path, stat, df)
+            except OSError as e:
+                print(f"Could not write cache for {path}: {e}")
+    return df
+
+
+def clear_cache(path):
+    """Remove the sidecar for a CSV."""
+    for p in (sidecar_path(path), sidecar_path(path) + ".json"):
+        if os.path.exists(p):
+            os.remove(p)
@@ -0,0 +1,268 @@
+"""Content-addressed cache for intermediate results across runs.
+
+A cached stage is keyed by a fingerprint of its inputs (files by path, size
+and mtime, or by content with strict=True; a store directory by its manifest,
+other directories by their files; frames and arrays by their values), its
+parameters and a code version (unless one is given, the hash of the
+function's source and of every buoy module its module depends on, so a change
+to a shared helper also invalidates the stages that use it). Frames are
+stored as uncompressed Feather and memory-mapped on load; anything else is
+pickled. The cache keeps a JSON index
+of sizes and last use, and evicts least-recently-used entries beyond
+max_bytes / max_entries.
+
+    @cached("monthly_wvht")
+    def monthly_wvht(path):
+        ...
+
+Stages that take a file path do their own loading, so a hit never opens the
+raw data: re-running a report after changing only its plots reads the cached
+tables. Set BUOY_MEMO_DIR to move the cache, or BUOY_MEMO=0 to bypass it.
+"""
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+MEMO_DIR = os.path.join(os.path.expanduser("~"), ".cache", "buoy", "memo")
+MAX_BYTES = 2 * 2 ** 30
+INDEX = "_index.json"
+
+
+def fingerprint(value, strict=False):
+    """Stable string identifying a stage input or parameter."""
+    if isinstance(value, str) and os.path.isfile(value):
+        if strict:
+            from buoy.loader import file_hash
+
+            return f"file-sha1:{file_hash(value)}"
+        stat = os.stat(value)
+        return f"file:{os.path.abspath(value)}:{stat.st_size}:{stat.st_mtime_ns}"
+    if isinstance(value, str) and os.path.isdir(value):
+        from buoy.store import MANIFEST
+
+        digest = hashlib.sha1()
+        manifest = os.path.join(value, MANIFEST)
+        if os.path.isfile(manifest):
+            # A store's manifest records the rows and parts of every partition,
+            # so it changes with each ingest
+            with open(manifest, "rb") as f:
+                digest.update(f.read())
+            return f"store:{os.path.abspath(value)}:{digest.hexdigest()}"
+        for dirpath, dirnames, filenames in os.walk(value):
+            dirnames.sort()
+            for name in sorted(filenames):
+                digest.update(fingerprint(os.path.join(dirpath, name), strict).encode())
+        return f"dir:{os.path.abspath(value)}:{digest.hexdigest()}"
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.sha1(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        columns = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr((columns, [str(t) for t in np.atleast_1d(value.dtypes)])).encode())
+        return f"frame:{digest.hexdigest()}"
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(value).view(np.uint8).tobytes())
+        return f"array:{value.dtype}:{value.shape}:{digest.hexdigest()}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(fingerprint(v, strict) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k}={fingerprint(value[k], strict)}" for k in sorted(value)) + "}"
+    return repr(value)
+
+
+def _module_source(name):
+    """Source of a buoy module from its file (without importing it), or None."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    base = os.path.join(root, *name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+    return None
+
+
+def module_deps(name, package="buoy"):
+    """{module: source} for `name` and the package modules it imports, directly
+    or through other package modules (imports inside functions included)."""
+    sources = {}
+    todo = [name]
+    while todo:
+        module = todo.pop()
+        if module in sources:
+            continue
+        source = _module_source(module)
+        if source is None:
+            continue
+        sources[module] = source
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                # `from buoy import loader` names a module; `from buoy.loader import x` does not
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            todo += [n for n in names if n.split(".")[0] == package and n != package]
+    return sources
+
+
+def code_version(func):
+    """Hash of the function's source and of the buoy modules it depends on."""
+    digest = hashlib.sha1()
+    try:
+        digest.update(inspect.getsource(func).encode())
+    except (OSError, TypeError):
+        digest.update(func.__qualname__.encode())
+    for name, source in sorted(module_deps(func.__module__).items()):
+        digest.update(name.encode())
+        digest.update(source.encode())
+    return digest.hexdigest()[:12]
+
+
+class MemoCache:
+    def __init__(self, root=None, max_bytes=MAX_BYTES, max_entries=None):
+        self.root = root or os.environ.get("BUOY_MEMO_DIR", MEMO_DIR)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.enabled = os.environ.get("BUOY_MEMO", "1") != "0"
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+        self.index_path = os.path.join(self.root, INDEX)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def key(self, stage, version, inputs):
+        text = json.dumps({"stage": stage, "version": version, "inputs": inputs}, sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path(self, key, kind):
+        return os.path.join(self.root, f"{key}.{kind}")
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, key):
+        """(True, value) on a hit, (False, None) on a miss."""
+        entry = self.index.get(key)
+        if entry is None or not os.path.exists(self._path(key, entry["kind"])):
+            self.misses += 1
+            return False, None
+        path = self._path(key, entry["kind"])
+        if entry["kind"] == "feather":
+            import pyarrow.feather as feather
+
+            value = feather.read_table(path, memory_map=True).to_pandas()
+            if entry.get("index"):
+                value = value.set_index(entry["index"])
+                value.index.names = [None if n == "__index__" else n for n in value.index.names]
+            if entry.get("series"):
+                value = value[value.columns[0]]
+                value.name = entry["series"][0]
+        else:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        entry["last_used"] = time.time()
+        self._save_index()
+        self.hits += 1
+        return True, value
+
+    def put(self, key, value, stage=""):
+        entry = {"stage": stage, "created": time.time(), "last_used": time.time()}
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        if isinstance(frame, pd.DataFrame) and all(isinstance(c, str) for c in frame.columns):
+            import pyarrow.feather as feather
+
+            entry["kind"] = "feather"
+            if isinstance(value, pd.Series):
+                entry["series"] = [value.name]
+            if not isinstance(frame.index, pd.RangeIndex):
+                names = [n or "__index__" for n in frame.index.names]
+                entry["index"] = names
+                frame = frame.rename_axis(names).reset_index()
+            path = self._path(key, "feather")
+            feather.write_feather(frame.reset_index(drop=True), path + ".tmp",
+                                  compression="uncompressed")
+        else:
+            entry["kind"] = "pickle"
+            path = self._path(key, "pickle")
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+        entry["bytes"] = os.path.getsize(path)
+        self.index[key] = entry
+        self.evict()
+        self._save_index()
+
+    def evict(self):
+        """Drop least-recently-used entries until within max_bytes and max_entries."""
+        by_age = sorted(self.index, key=lambda k: self.index[k]["last_used"])
+        total = sum(e["bytes"] for e in self.index.values())
+        while by_age and (total > self.max_bytes
+                          or (self.max_entries is not None and len(self.index) > self.max_entries)):
+            key = by_age.pop(0)
+            entry = self.index.pop(key)
+            total -= entry["bytes"]
+            path = self._path(key, entry["kind"])
+            if os.path.exists(path):
+                os.remove(path)
+
+    def clear(self):
+        for key, entry in self.index.items():
+            path = self._path(key, entry["kind"])
+            if os.path.exists(path):
+                os.remove(path)
+        self.index = {}
+        self._save_index()
+
+    def size(self):
+        return sum(e["bytes"] for e in self.index.values())
+
+
+_default = None
+
+
+def default_cache():
+    global _default
+    if _default is None:
+        _default = MemoCache()
+    return _default
+
+
+def cached(stage=None, cache=None, version=None, strict=False):
+    """Memoize a function on disk, keyed by its arguments and source code."""
+    def decorate(func):
+        name = stage or func.__name__
+        signature = inspect.signature(func)
+        func_version = version or code_version(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            store = cache or default_cache()
+            if not store.enabled:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            inputs = {k: fingerprint(v, strict) for k, v in bound.arguments.items()}
+            key = store.key(name, func_version, inputs)
+            hit, value = store.get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            store.put(key, value, stage=name)
+            return value
+
+        wrapper.stage = name
+        return wrapper
+    return decorate
@@ -0,0 +1,109 @@
+"""Per-station analyses fanned out over a process pool.
+
+Each worker reads one station from the partitioned store itself (nothing big is
+sent to it), runs cleaning, gap-limited interpolation, storm detection and daily
+aggregation, and hands back its result tables as Arrow IPC buffers rather than
+pickled DataFrames. The parent stitches those together; `run_serial` runs the
+exact same per-station code in-process, so both paths produce the same output.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from buoy.interp import interpolate_stations
+from buoy.quality import FLAG_COLUMN, mask_frame
+from buoy.storms import StormDetector, WSPD_THRESHOLD, WVHT_THRESHOLD
+from buoy.store import PartitionedStore
+from buoy.timeparse import add_datetime
+
+COLUMNS = ["YY", "MM", "DD", "hh", "mm", "WSPD", "GST", "WVHT", FLAG_COLUMN]
+
+
+def analyze_station(df, station, max_gap="3h", wspd_threshold=WSPD_THRESHOLD,
+                    wvht_threshold=WVHT_THRESHOLD):
+    """Clean, interpolate and summarise one station. Returns a dict of frames."""
+    df = df.copy()
+    valid = add_datetime(df)
+    df = df[valid].sort_values("datetime", kind="stable").reset_index(drop=True)
+    if FLAG_COLUMN not in df.columns:
+        mask_frame(df)  # the store masks at ingest; other frames are masked here
+    df, filled = interpolate_stations(df, columns=["WSPD", "GST", "WVHT"], by=None,
+                                      max_gap=max_gap)
+
+    detector = StormDetector(wspd_threshold, wvht_threshold)
+    events = detector.update(df["datetime"].to_numpy(), df["WSPD"].to_numpy(),
+                             df["WVHT"].to_numpy()) + detector.finish()
+    storms = pd.DataFrame(events)
+    storms.insert(0, "station_id", str(station))
+
+    df["storm_intensity"] = df["WSPD"] * df["WVHT"]
+    daily = df.groupby(df["datetime"].dt.floor("D")).agg(
+        WSPD_sum=("WSPD", "sum"), WSPD_count=("WSPD", "count"), WSPD_max=("WSPD", "max"),
+        WVHT_sum=("WVHT", "sum"), WVHT_count=("WVHT", "count"), WVHT_max=("WVHT", "max"),
+        intensity_sum=("storm_intensity", "sum"), intensity_count=("storm_intensity", "count"),
+        intensity_max=("storm_intensity", "max"),
+    ).reset_index().rename(columns={"datetime": "date"})
+    daily.insert(0, "station_id", str(station))
+
+    summary = pd.DataFrame({"station_id": [str(station)], "rows": [len(df)],
+                            "filled_WSPD": [int(filled["WSPD"].sum())],
+                            "filled_WVHT": [int(filled["WVHT"].sum())]})
+    return {"storms": storms, "daily": daily, "summary": summary}
+
+
+def to_arrow_bytes(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_arrow_bytes(data):
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+
+def _station_task(args):
+    store_root, station, years, params = args
+    store = PartitionedStore(store_root)
+    df = store.read(stations=[station], years=years, columns=COLUMNS)
+    results = analyze_station(df.drop(columns="station_id"), station, **params)
+    return {name: to_arrow_bytes(frame) for name, frame in results.items()}
+
+
+def merge_results(results):
+    """Concatenate per-station result dicts into the combined tables."""
+    merged = {}
+    for name in ["storms", "daily", "summary"]:
+        frames = [r[name] for r in results if len(r[name])]
+        merged[name] = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    daily = merged["daily"]
+    if len(daily):
+        for col in ["WSPD", "WVHT", "intensity"]:
+            daily[f"{col}_mean"] = daily[f"{col}_sum"] / daily[f"{col}_count"]
+    return merged
+
+
+def run_serial(store_root, stations=None, years=None, **params):
+    store = PartitionedStore(store_root)
+    stations = stations or sorted({p.split("/")[0].split("=")[1] for p in store.partitions()})
+    results = []
+    for station in stations:
+        df = store.read(stations=[station], years=years, columns=COLUMNS)
+        results.append(analyze_station(df.drop(columns="station_id"), station, **params))
+    return merge_results(results)
+
+
+def run_parallel(store_root, stations=None, years=None, workers=None, **params):
+    """Same output as run_serial, with one process-pool task per station."""
+    store = PartitionedStore(store_root)
+    stations = stations or sorted({p.split("/")[0].split("=")[1] for p in store.partitions()})
+    workers = workers or os.cpu_count()
+    tasks = [(store_root, station, years, params) for station in stations]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        buffers = list(pool.map(_station_task, tasks))
+    results = [{name: from_arrow_bytes(data) for name, data in b.items()} for b in buffers]
+    return merge_results(results)
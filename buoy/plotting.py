@@ -0,0 +1,188 @@
+"""Downsampled line plots for long 10-minute series.
+
+A figure a few thousand pixels wide cannot show more than a few points per
+pixel column, so each series is reduced before drawing:
+
+- `minmax_downsample` keeps the lowest and highest reading of every
+  pixel-wide time bucket, in time order, so every peak and trough stays
+  visible; empty or all-NaN buckets break the line like a data gap.
+- `lttb` (Largest Triangle Three Buckets) keeps one representative point per
+  bucket; smoother to look at, but single-sample spikes can be dropped.
+
+`plot_lines` draws any number of downsampled series as one LineCollection.
+`new_figure` builds a Figure on the Agg canvas directly, so rendering is
+headless without switching the pyplot backend of the calling script.
+"""
+import numpy as np
+
+DEFAULT_WIDTH_PX = 1200
+
+
+def _as_numbers(x):
+    """x as a numeric array (datetimes as int64 ns), plus the dtype to convert back to."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.view("i8"), x.dtype
+    return x, None
+
+
+def _restore(x, dtype):
+    if dtype is None:
+        return x
+    return np.asarray(x).astype(np.int64).view(dtype)
+
+
+def minmax_downsample(x, y, n_buckets=DEFAULT_WIDTH_PX):
+    """Min and max of y in n_buckets equal-width x buckets (x sorted).
+
+    Returns at most 2 * n_buckets points in x order.
+    """
+    xn, dtype = _as_numbers(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.asarray(x), y.astype(np.float64)
+    edges = np.linspace(float(xn[0]), float(xn[-1]), n_buckets + 1)[1:-1].astype(xn.dtype)
+    bounds = np.searchsorted(xn, edges, side="left")
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [n]])
+
+    # Row positions of the kept points; -1 marks a break in the line
+    filled = starts < ends
+    lo = np.full(n_buckets, np.nan)
+    hi = np.full(n_buckets, np.nan)
+    lo[filled] = np.fmin.reduceat(y, starts[filled])
+    hi[filled] = np.fmax.reduceat(y, starts[filled])
+    picks = []
+    for a, b, mn, mx in zip(starts, ends, lo, hi):
+        if np.isnan(mn):
+            # Empty or all-NaN bucket: one break per run of them
+            if picks and picks[-1] != -1:
+                picks.append(-1)
+            continue
+        seg = y[a:b]
+        picks.extend(sorted({a + int(np.argmax(seg == mn)), a + int(np.argmax(seg == mx))}))
+    picks = np.array(picks, dtype=np.int64)
+    breaks = picks < 0
+    # A break sits on the previous point's x so x stays sorted
+    rows = np.maximum.accumulate(np.where(breaks, 0, picks))
+    out_x = xn[rows]
+    out_y = y[rows].astype(np.float64)
+    out_y[breaks] = np.nan
+    return _restore(out_x, dtype), out_y
+
+
+def lttb(x, y, n_out=DEFAULT_WIDTH_PX):
+    """Largest Triangle Three Buckets downsampling to n_out points.
+
+    NaN readings are dropped first, so gaps are bridged rather than shown.
+    """
+    xn, dtype = _as_numbers(x)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        xn, y = xn[valid], y[valid]
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return _restore(xn, dtype), y
+
+    # Offsets from the first x keep datetimes small enough for float64 products
+    xf = (xn - xn[0]).astype(np.float64)
+    # Buckets over the inner points; the first and last points are always kept
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(np.append(bounds, n))
+    mean_x = np.add.reduceat(xf, bounds) / counts
+    mean_y = np.add.reduceat(y, bounds) / counts
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        # Triangle with the previous pick and the next bucket's centroid
+        cx, cy = mean_x[i + 1], mean_y[i + 1]
+        ax, ay = xf[a], y[a]
+        # |(ax - cx)(y - ay) - (ax - x)(cy - ay)|, expanded to save temporaries
+        area = (ax - cx) * y[lo:hi]
+        area += (cy - ay) * xf[lo:hi]
+        area += -(ax - cx) * ay - (cy - ay) * ax
+        np.abs(area, out=area)
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return _restore(xn[picked], dtype), y[picked]
+
+
+def downsample(x, y, n=DEFAULT_WIDTH_PX, method="minmax"):
+    if method == "minmax":
+        return minmax_downsample(x, y, n)
+    if method == "lttb":
+        return lttb(x, y, n)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+
+def frame_series(df, x, y, by):
+    """{group: (x values, y values)} for each group of a frame, sorted by x."""
+    df = df.sort_values([by, x], kind="stable")
+    return {key: (group[x].to_numpy(), group[y].to_numpy())
+            for key, group in df.groupby(by, sort=True)}
+
+
+def new_figure(figsize=(12, 6), dpi=100):
+    """A Figure with an Agg canvas and one Axes, independent of pyplot."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _segments(x, y):
+    """Split a series at NaNs into (k, 2) vertex arrays."""
+    points = np.column_stack([x, y])
+    bad = np.isnan(y)
+    if not bad.any():
+        return [points]
+    cuts = np.flatnonzero(bad)
+    pieces = np.split(points, cuts)
+    return [p[~np.isnan(p[:, 1])] for p in pieces if (~np.isnan(p[:, 1])).sum() > 1]
+
+
+def plot_lines(ax, series, method="minmax", width_px=None, colors=None, linewidth=1.0,
+               legend=True, **kwargs):
+    """Draw {label: (x, y)} series on ax as one LineCollection after downsampling.
+
+    width_px defaults to the axes width in pixels. Returns the collection.
+    """
+    import matplotlib.dates as mdates
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
+    width_px = width_px or max(int(ax.get_window_extent().width), 100)
+    if colors is None:
+        colors = [f"C{i % 10}" for i in range(len(series))]
+
+    segments, segment_colors, handles = [], [], []
+    is_dates = False
+    for (label, (x, y)), color in zip(series.items(), colors):
+        dx, dy = downsample(x, y, width_px, method)
+        if np.issubdtype(np.asarray(dx).dtype, np.datetime64):
+            is_dates = True
+            dx = mdates.date2num(dx)
+        pieces = _segments(np.asarray(dx, dtype=np.float64), dy)
+        segments.extend(pieces)
+        segment_colors.extend([color] * len(pieces))
+        handles.append(Line2D([], [], color=color, linewidth=linewidth, label=str(label)))
+
+    collection = LineCollection(segments, colors=segment_colors, linewidths=linewidth, **kwargs)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    if is_dates:
+        ax.xaxis_date()
+    if legend and len(handles) > 1:
+        ax.legend(handles=handles)
+    return collection
+
+
+def save_figure(fig, path, **kwargs):
+    fig.tight_layout()
+    fig.savefig(path, **kwargs)
@@ -0,0 +1,103 @@
+"""Per-column NDBC missing-value sentinels and a uint16 quality-flag bitmask.
+
+NDBC marks a missing reading with a column-specific sentinel: 99.0 for wind,
+waves, visibility and tide, 999 for directions and temperatures, 9999.0 for
+pressure. Replacing 99/999/9999 in every column also wipes real values (a
+999 hPa pressure reading, for one), so each column is checked only against
+its own sentinel.
+
+`mask_arrays` / `mask_frame` do this once, right after parsing: float columns
+get NaN in place of the sentinel, and a `QC` column records one bit per
+measurement that was missing (sentinel or NaN). Integer columns (WDIR, MWD)
+keep their 999 and rely on the flag. Later stages select rows with
+`valid(df, ["WVHT"])` instead of building filtered copies:
+
+    df = read_stdmet(path, mask=True)
+    wvht = df["WVHT"].where(valid(df, ["WVHT"]))
+"""
+import numpy as np
+
+SENTINELS = {
+    "WDIR": 999, "WSPD": 99.0, "GST": 99.0, "WVHT": 99.0, "DPD": 99.0, "APD": 99.0,
+    "MWD": 999, "PRES": 9999.0, "ATMP": 999.0, "WTMP": 999.0, "DEWP": 999.0,
+    "VIS": 99.0, "TIDE": 99.0,
+}
+# Bit i of QC is set when SENTINELS' i-th column is missing
+BITS = {col: np.uint16(1 << i) for i, col in enumerate(SENTINELS)}
+FLAG_COLUMN = "QC"
+
+
+def missing(values, column):
+    """Boolean array: True where values hold the column's sentinel or NaN."""
+    values = np.asarray(values)
+    bad = values == SENTINELS[column]
+    if values.dtype.kind == "f":
+        bad |= np.isnan(values)
+    return bad
+
+
+def masked(values, column):
+    """values as float64 with the column's sentinel (if it has one) as NaN, in a new array."""
+    values = np.asarray(values, dtype=np.float64)
+    if column in SENTINELS:
+        values = np.where(values == SENTINELS[column], np.nan, values)
+    return values
+
+
+def mask_arrays(columns):
+    """Mask sentinels in a {name: array} dict in place and return the QC flags.
+
+    Float arrays must be writable; they get NaN where the sentinel was.
+    """
+    n = len(next(iter(columns.values()))) if columns else 0
+    flags = np.zeros(n, dtype=np.uint16)
+    for col, values in columns.items():
+        if col not in SENTINELS:
+            continue
+        bad = missing(values, col)
+        np.bitwise_or(flags, BITS[col], out=flags, where=bad)
+        if values.dtype.kind == "f":
+            values[bad] = np.nan
+    return flags
+
+
+def mask_frame(df, columns=None):
+    """mask_arrays for a DataFrame: sentinels to NaN and a QC column, in place."""
+    columns = [c for c in (columns or SENTINELS) if c in df.columns]
+    flags = np.zeros(len(df), dtype=np.uint16)
+    if FLAG_COLUMN in df.columns:
+        flags |= df[FLAG_COLUMN].to_numpy(dtype=np.uint16)
+    for col in columns:
+        values = df[col].to_numpy()
+        bad = missing(values, col)
+        if not bad.any():
+            continue
+        np.bitwise_or(flags, BITS[col], out=flags, where=bad)
+        if values.dtype.kind == "f":
+            df[col] = np.where(bad, np.nan, values)
+    df[FLAG_COLUMN] = flags
+    return df
+
+
+def flags_of(df_or_flags):
+    if hasattr(df_or_flags, "columns"):
+        return df_or_flags[FLAG_COLUMN].to_numpy()
+    return np.asarray(df_or_flags)
+
+
+def bitmask(columns):
+    bits = np.uint16(0)
+    for col in columns:
+        bits |= BITS[col]
+    return bits
+
+
+def valid(df_or_flags, columns):
+    """Boolean row mask: none of the given columns is flagged missing."""
+    return (flags_of(df_or_flags) & bitmask(columns)) == 0
+
+
+def missing_counts(df_or_flags):
+    """{column: rows flagged missing} from the QC bitmask."""
+    flags = flags_of(df_or_flags)
+    return {col: int(np.count_nonzero(flags & bit)) for col, bit in BITS.items()}
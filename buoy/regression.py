@@ -0,0 +1,141 @@
+"""Incremental least-squares fits from mergeable sufficient statistics.
+
+0055 and 0056 refit sklearn's LinearRegression on every run to regress WVHT on
+WSPD. An ordinary least-squares fit only needs n, the feature sums, the target
+sum and the Gram matrices X'X and X'y, and those add up across chunks, stations
+and years. OLSStats keeps exactly those; the store keeps one per partition, and
+solving a merged fit is a p x p linear solve (microseconds for a few features).
+"""
+import numpy as np
+
+from buoy.quality import masked
+
+HURRICANE_CATEGORIES = ["Category 1", "Category 2", "Category 3", "Category 4", "Category 5"]
+HURRICANE_WINDS = [37.5, 46, 54, 64, 75]
+
+
+class OLSStats:
+    def __init__(self, features=("WSPD",), target="WVHT"):
+        self.features = list(features)
+        self.target = target
+        p = len(self.features)
+        self.n = 0
+        self.sum_x = np.zeros(p)
+        self.sum_y = 0.0
+        self.sum_xx = np.zeros((p, p))
+        self.sum_xy = np.zeros(p)
+        self.sum_yy = 0.0
+
+    def update(self, x, y, sentinel=None):
+        """Add rows; rows with a NaN (or the sentinel, if given) anywhere are skipped."""
+        x = np.asarray(x, dtype=np.float64).reshape(len(y), -1)
+        y = np.asarray(y, dtype=np.float64)
+        keep = ~(np.isnan(x).any(axis=1) | np.isnan(y))
+        if sentinel is not None:
+            keep &= ~((x == sentinel).any(axis=1) | (y == sentinel))
+        x, y = x[keep], y[keep]
+        self.n += len(y)
+        self.sum_x += x.sum(axis=0)
+        self.sum_y += y.sum()
+        self.sum_xx += x.T @ x
+        self.sum_xy += x.T @ y
+        self.sum_yy += y @ y
+        return self
+
+    def update_frame(self, df):
+        """Add a frame's rows, leaving out NaNs and each column's own sentinel (buoy.quality)."""
+        x = np.column_stack([masked(df[col].to_numpy(), col) for col in self.features])
+        return self.update(x, masked(df[self.target].to_numpy(), self.target))
+
+    def merge(self, other):
+        """Fold another OLSStats (same features and target) into this one."""
+        if other.features != self.features or other.target != self.target:
+            raise ValueError("Cannot merge fits of different variables")
+        self.n += other.n
+        self.sum_x += other.sum_x
+        self.sum_y += other.sum_y
+        self.sum_xx += other.sum_xx
+        self.sum_xy += other.sum_xy
+        self.sum_yy += other.sum_yy
+        return self
+
+    def solve(self):
+        """(coefficients, intercept) of the least-squares fit.
+
+        Works on the centred Gram matrix, which is better conditioned than the
+        raw sums; falls back to lstsq when the features are collinear.
+        """
+        if self.n < 2:
+            raise ValueError("Need at least two rows to fit")
+        mean_x = self.sum_x / self.n
+        mean_y = self.sum_y / self.n
+        sxx = self.sum_xx - self.n * np.outer(mean_x, mean_x)
+        sxy = self.sum_xy - self.n * mean_x * mean_y
+        try:
+            coef = np.linalg.solve(sxx, sxy)
+        except np.linalg.LinAlgError:
+            coef = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+        return coef, mean_y - mean_x @ coef
+
+    @property
+    def coef_(self):
+        return self.solve()[0]
+
+    @property
+    def intercept_(self):
+        return self.solve()[1]
+
+    def predict(self, x):
+        coef, intercept = self.solve()
+        x = np.asarray(x, dtype=np.float64)
+        return x.reshape(-1, len(coef)) @ coef + intercept
+
+    def r2(self):
+        """Coefficient of determination of the fit on the accumulated rows."""
+        coef, intercept = self.solve()
+        mean_y = self.sum_y / self.n
+        total = self.sum_yy - self.n * mean_y ** 2
+        # Residual sum of squares expanded in terms of the stored sums
+        beta = np.concatenate([[intercept], coef])
+        gram = np.block([[np.array([[self.n]]), self.sum_x[None, :]],
+                         [self.sum_x[:, None], self.sum_xx]])
+        xty = np.concatenate([[self.sum_y], self.sum_xy])
+        residual = self.sum_yy - 2 * beta @ xty + beta @ gram @ beta
+        return 1 - residual / total
+
+    def save(self, path):
+        np.savez(path, features=np.array(self.features), target=np.array(self.target),
+                 n=self.n, sum_x=self.sum_x, sum_y=self.sum_y, sum_xx=self.sum_xx,
+                 sum_xy=self.sum_xy, sum_yy=self.sum_yy)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            stats = cls([str(f) for f in data["features"]], str(data["target"]))
+            stats.n = int(data["n"])
+            stats.sum_x = data["sum_x"].copy()
+            stats.sum_y = float(data["sum_y"])
+            stats.sum_xx = data["sum_xx"].copy()
+            stats.sum_xy = data["sum_xy"].copy()
+            stats.sum_yy = float(data["sum_yy"])
+        return stats
+
+
+def fit(df, features=("WSPD",), target="WVHT"):
+    """One-shot fit of a frame, the drop-in for LinearRegression().fit(X, y)."""
+    return OLSStats(features, target).update_frame(df)
+
+
+def merge_all(stats, features=("WSPD",), target="WVHT"):
+    merged = OLSStats(features, target)
+    for s in stats:
+        merged.merge(s)
+    return merged
+
+
+def category_wave_heights(stats, winds=HURRICANE_WINDS, categories=HURRICANE_CATEGORIES):
+    """The 0055 table of predicted wave height per hurricane category."""
+    import pandas as pd
+
+    return pd.DataFrame({"Hurricane Category": categories,
+                         "Predicted WVHT": stats.predict(np.asarray(winds, dtype=np.float64))})
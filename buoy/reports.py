@@ -0,0 +1,72 @@
+"""The intermediate tables of the 0053-0055 reports, memoized with buoy.memo.
+
+Each function takes the path of a single-station CSV (the noaa_44025_*.csv
+files the scripts read) and its parameters, and returns the same table the
+scripts build inline. Results are cached on disk, so a second run with the
+same file and parameters does not read the CSV at all. Sentinels are masked
+once, when the frame is loaded (buoy.quality):
+
+    from buoy import reports
+    daily = reports.significant_storms_daily("noaa_44025_2019_2024.csv")
+"""
+import pandas as pd
+
+from buoy.memo import cached
+from buoy.quality import valid
+
+
+def load_frame(path):
+    """The station CSV, sentinels masked, with a datetime column (Feather-cached by buoy.loader)."""
+    from buoy.loader import load_stdmet
+    from buoy.quality import mask_frame
+    from buoy.timeparse import add_datetime
+
+    df = mask_frame(load_stdmet(path))
+    add_datetime(df)
+    return df
+
+
+@cached("df_clean")
+def df_clean(path):
+    """0054: the masked frame without the rows that have no WVHT."""
+    df = load_frame(path)
+    return df[valid(df, ["WVHT"])].reset_index(drop=True)
+
+
+@cached("monthly_wvht")
+def monthly_wvht(path):
+    """0053: mean WVHT per year and month with a first-of-month date column."""
+    df = load_frame(path)
+    # Masked values are NaN, so months with no valid reading drop out
+    wvht = df["WVHT"]
+    monthly = wvht.groupby([df["datetime"].dt.year.rename("year"),
+                            df["datetime"].dt.month.rename("month")]).mean().dropna()
+    monthly = monthly.reset_index()
+    monthly["date"] = pd.to_datetime(monthly[["year", "month"]].assign(day=1))
+    return monthly
+
+
+@cached("wave_height_threshold")
+def wave_height_threshold(path, quantile=0.95):
+    """0054: the WVHT percentile that defines a significant storm."""
+    return float(df_clean(path)["WVHT"].quantile(quantile))
+
+
+@cached("significant_storms_daily")
+def significant_storms_daily(path, quantile=0.95):
+    """0054: daily maximum wave height over readings at or above the threshold."""
+    clean = df_clean(path)
+    threshold = wave_height_threshold(path, quantile)
+    significant = clean[clean["WVHT"] >= threshold]
+    daily = significant.groupby(significant["datetime"].dt.date)["WVHT"].max().reset_index()
+    daily.columns = ["date", "max_wave_height"]
+    daily["date"] = pd.to_datetime(daily["date"])
+    return daily
+
+
+@cached("storm_events")
+def storm_events(path, wspd_threshold=15.0, wvht_threshold=2.0):
+    """0055: storm table (time-interpolated WSPD/WVHT above both thresholds)."""
+    from buoy.storms import detect_storms
+
+    return detect_storms([load_frame(path)], wspd_threshold, wvht_threshold)
@@ -0,0 +1,121 @@
+"""Mergeable quantile sketch (KLL) for thresholds such as the 0054 95th percentile.
+
+A KLLSketch keeps a few hundred weighted samples per column no matter how many
+values it has seen. Sketches can be updated chunk by chunk, saved next to a
+store partition and merged for any station/year selection.
+
+Error bound: a quantile query returns a value whose rank is within about
+eps * n of the requested rank, where eps ~= 2.296 / k**0.9723 with 99%
+confidence (the Apache DataSketches fit for this compactor scheme), i.e.
+about 1.3% for the default k=200. `exact_quantile` is the pandas path for checking.
+"""
+import numpy as np
+
+DEFAULT_K = 200
+CAPACITY_RATIO = 2 / 3
+MIN_CAPACITY = 8
+
+
+def rank_error(k=DEFAULT_K):
+    """Normalized rank error bound (99% confidence) for a sketch of size k."""
+    return 2.296 / k ** 0.9723
+
+
+def exact_quantile(values, q, sentinel=None):
+    """The 0054 computation: drop NaNs (and the sentinel, if given) and take the pandas quantile."""
+    import pandas as pd
+
+    values = pd.Series(values, dtype="float64")
+    if sentinel is not None:
+        values = values.replace(sentinel, np.nan)
+    values = values.dropna()
+    return values.quantile(q)
+
+
+class KLLSketch:
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(MIN_CAPACITY, int(np.ceil(self.k * CAPACITY_RATIO ** depth)))
+
+    def update(self, values, sentinel=None):
+        """Add a chunk of values; NaNs (and the sentinel, if given) are skipped."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        keep = ~np.isnan(values)
+        if sentinel is not None:
+            keep &= values != sentinel
+        values = values[keep]
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.n += len(values)
+            self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self.capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # Odd counts leave one item behind so total weight is preserved
+            leftover = items[:len(items) % 2]
+            items = items[len(items) % 2:]
+            promoted = items[self.rng.integers(2)::2]
+            self.levels[level] = leftover
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Capacities shift when a level is added, so restart from the bottom
+            level = 0
+
+    def merge(self, other):
+        """Fold another sketch into this one and return self."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Approximate quantile(s) for q in [0, 1]; NaN if the sketch is empty."""
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level, dtype=np.int64)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype=np.float64) * cumulative[-1]
+        idx = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return items[idx] if np.ndim(q) else float(items[idx])
+
+    def save(self, path):
+        arrays = {f"level_{i}": items for i, items in enumerate(self.levels)}
+        np.savez(path, k=self.k, n=self.n, **arrays)
+
+    @classmethod
+    def load(cls, path, seed=None):
+        with np.load(path) as data:
+            sketch = cls(k=int(data["k"]), seed=seed)
+            sketch.n = int(data["n"])
+            count = len([name for name in data.files if name.startswith("level_")])
+            sketch.levels = [data[f"level_{i}"] for i in range(count)]
+        return sketch
+
+
+def merge_all(sketches, k=DEFAULT_K, seed=0):
+    """Merge sketches into a new one. The seed fixes which items each compaction
+    keeps, so the same inputs in the same order always give the same quantiles."""
+    merged = KLLSketch(k=k, seed=seed)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
@@ -0,0 +1,109 @@
+"""Local stand-in for the NDBC historical data server.
+
+Serves every *.txt.gz file in a directory at the same paths NDBC uses, so the
+downloader can be exercised offline:
+
+    /data/historical/stdmet/<file>.txt.gz          raw gzip bytes
+    /view_text_file.php?filename=<file>.txt.gz     decompressed text
+
+Run it with `python -m buoy.standin <fixture dir> [--port 8000]`.
+"""
+import argparse
+import gzip
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from buoy.loader import COLUMNS
+
+HEADER_LINES = [
+    "#" + " ".join(COLUMNS),
+    "#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC  mi    ft",
+]
+
+
+def write_fixture(df, path):
+    """Write a frame with the stdmet columns as an NDBC-style .txt.gz file."""
+    with gzip.open(path, "wt") as f:
+        f.write("\n".join(HEADER_LINES) + "\n")
+        df[COLUMNS].to_csv(f, sep=" ", header=False, index=False)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/data/historical/stdmet/"):
+            name = os.path.basename(parts.path)
+            decompress = False
+        elif parts.path == "/view_text_file.php":
+            name = parse_qs(parts.query).get("filename", [""])[0]
+            decompress = True
+        else:
+            return self.send_error(404)
+
+        with server.lock:
+            server.request_counts[name] = server.request_counts.get(name, 0) + 1
+            attempt = server.request_counts[name]
+        if server.delay:
+            time.sleep(server.delay)
+        if attempt <= server.fail_first:
+            return self.send_error(503)
+
+        path = os.path.join(server.fixture_dir, os.path.basename(name))
+        if not name.endswith(".txt.gz") or not os.path.exists(path):
+            return self.send_error(404)
+        with open(path, "rb") as f:
+            body = f.read()
+        if decompress:
+            body = gzip.decompress(body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain" if decompress else "application/x-gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(fixture_dir, port=0, delay=0.0, fail_first=0):
+    """Start the stand-in on a background thread. Returns (server, base_url).
+
+    delay adds latency to every request; fail_first makes the first N requests
+    for each file answer 503 so retry handling can be checked.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.daemon_threads = True
+    server.fixture_dir = fixture_dir
+    server.delay = delay
+    server.fail_first = fail_first
+    server.request_counts = {}
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve NDBC fixture files locally")
+    parser.add_argument("fixture_dir")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--fail-first", type=int, default=0)
+    args = parser.parse_args()
+    server, base_url = start_server(args.fixture_dir, args.port, args.delay, args.fail_first)
+    print(f"Serving {args.fixture_dir} at {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
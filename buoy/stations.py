@@ -0,0 +1,197 @@
+"""Buoy station registry with a k-d tree for spatial queries.
+
+Stations are placed on the unit sphere (x, y, z); straight-line (chord) distance
+there grows with great-circle distance, so an ordinary 3-D k-d tree answers
+"stations within R km" and "k nearest stations" in logarithmic time.
+
+The station list comes from NDBC's station_table.txt, cached locally as JSON.
+When it cannot be downloaded the registry falls back to the stations the 0056
+scripts use.
+"""
+import heapq
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+STATION_TABLE_URL = "https://www.ndbc.noaa.gov/data/stations/station_table.txt"
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "buoy", "stations.json")
+CACHE_MAX_AGE = 30 * 24 * 3600
+LEAF_SIZE = 16
+
+# Stations used by 0056 at their 2012 positions (the ones in its CSV), so the
+# registry works offline; 0056/download.py uses these before the registry
+KNOWN_STATIONS = {
+    "44009": (38.460, -74.692),
+    "41013": (33.441, -77.764),
+    "42058": (14.512, -75.153),
+    "41010": (28.878, -78.467),
+    "44025": (40.251, -73.164),
+}
+
+LOCATION_RE = re.compile(r"([\d.]+)\s*([NS])\s+([\d.]+)\s*([EW])")
+
+
+def to_unit_vectors(lat, lon):
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def km_to_chord(km):
+    return 2 * np.sin(np.minimum(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+def parse_station_table(text):
+    """{station_id: (lat, lon, name)} from NDBC's pipe-separated station table."""
+    stations = {}
+    for line in text.splitlines():
+        if line.startswith("#") or "|" not in line:
+            continue
+        fields = [f.strip() for f in line.split("|")]
+        match = LOCATION_RE.search(fields[6]) if len(fields) > 6 else None
+        if not match:
+            continue
+        lat = float(match.group(1)) * (1 if match.group(2) == "N" else -1)
+        lon = float(match.group(3)) * (1 if match.group(4) == "E" else -1)
+        stations[fields[0].upper()] = (lat, lon, fields[4])
+    return stations
+
+
+class KDTree:
+    """Static k-d tree over 3-D points, stored as a permutation of the input."""
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.idx = np.arange(len(self.points))
+        self._build(0, len(self.idx), 0)
+
+    def _build(self, lo, hi, depth):
+        if hi - lo <= LEAF_SIZE:
+            return
+        axis = depth % 3
+        mid = (lo + hi) // 2
+        part = np.argpartition(self.points[self.idx[lo:hi], axis], mid - lo)
+        self.idx[lo:hi] = self.idx[lo:hi][part]
+        self._build(lo, mid, depth + 1)
+        self._build(mid + 1, hi, depth + 1)
+
+    def query_radius(self, q, r):
+        """Indices of points within chord distance r of q."""
+        found = []
+        stack = [(0, len(self.idx), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= LEAF_SIZE:
+                ids = self.idx[lo:hi]
+                d = np.linalg.norm(self.points[ids] - q, axis=1)
+                found.extend(ids[d <= r].tolist())
+                continue
+            mid = (lo + hi) // 2
+            pivot = self.idx[mid]
+            diff = q[depth % 3] - self.points[pivot, depth % 3]
+            if np.linalg.norm(self.points[pivot] - q) <= r:
+                found.append(pivot)
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            stack.append((*near, depth + 1))
+            if abs(diff) <= r:
+                stack.append((*far, depth + 1))
+        return found
+
+    def query_knn(self, q, k):
+        """(chord distances, indices) of the k nearest points, nearest first."""
+        heap = []  # max-heap of (-distance, index)
+
+        def consider(ids):
+            d = np.linalg.norm(self.points[ids] - q, axis=1)
+            for dist, i in zip(d, ids):
+                if len(heap) < k:
+                    heapq.heappush(heap, (-dist, i))
+                elif dist < -heap[0][0]:
+                    heapq.heapreplace(heap, (-dist, i))
+
+        def visit(lo, hi, depth):
+            if hi - lo <= LEAF_SIZE:
+                consider(self.idx[lo:hi])
+                return
+            mid = (lo + hi) // 2
+            pivot = self.idx[mid]
+            diff = q[depth % 3] - self.points[pivot, depth % 3]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            visit(*near, depth + 1)
+            consider(np.array([pivot]))
+            if len(heap) < k or abs(diff) < -heap[0][0]:
+                visit(*far, depth + 1)
+
+        visit(0, len(self.idx), 0)
+        result = sorted((-d, i) for d, i in heap)
+        return np.array([d for d, _ in result]), np.array([i for _, i in result], dtype=np.int64)
+
+
+class StationRegistry:
+    def __init__(self, stations):
+        """stations: {station_id: (lat, lon) or (lat, lon, name)}."""
+        self.ids = list(stations)
+        self.lat = np.array([stations[s][0] for s in self.ids], dtype=np.float64)
+        self.lon = np.array([stations[s][1] for s in self.ids], dtype=np.float64)
+        self.names = [stations[s][2] if len(stations[s]) > 2 else "" for s in self.ids]
+        self.position = {s: i for i, s in enumerate(self.ids)}
+        self.tree = KDTree(to_unit_vectors(self.lat, self.lon))
+
+    def location(self, station_id):
+        """(lat, lon) of a station, or (None, None) if unknown."""
+        i = self.position.get(str(station_id).upper())
+        return (None, None) if i is None else (self.lat[i], self.lon[i])
+
+    def within(self, lat, lon, radius_km):
+        """Stations within radius_km of a point, nearest first, as (id, km) pairs."""
+        q = to_unit_vectors(lat, lon)[0]
+        ids = self.tree.query_radius(q, km_to_chord(radius_km))
+        dist = chord_to_km(np.linalg.norm(self.tree.points[ids] - q, axis=1)) if ids else []
+        return sorted(((self.ids[i], float(d)) for i, d in zip(ids, dist)), key=lambda p: p[1])
+
+    def nearest(self, lat, lon, k=1):
+        """The k nearest stations to a point as (id, km) pairs."""
+        chords, ids = self.tree.query_knn(to_unit_vectors(lat, lon)[0], min(k, len(self.ids)))
+        return [(self.ids[i], float(d)) for i, d in zip(ids, chord_to_km(chords))]
+
+    def along_track(self, lats, lons, radius_km):
+        """Stations within radius_km of any point of a storm track."""
+        seen = {}
+        for lat, lon in zip(lats, lons):
+            for station, d in self.within(lat, lon, radius_km):
+                seen[station] = min(d, seen.get(station, np.inf))
+        return sorted(seen.items(), key=lambda p: p[1])
+
+
+def load_registry(cache_path=CACHE_PATH, max_age=CACHE_MAX_AGE, refresh=False):
+    """Registry from the local cache, refreshed from NDBC when stale or missing."""
+    stations = None
+    if not refresh and os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < max_age:
+        with open(cache_path) as f:
+            stations = {k: tuple(v) for k, v in json.load(f).items()}
+    if stations is None:
+        try:
+            import requests
+
+            response = requests.get(STATION_TABLE_URL, timeout=30)
+            response.raise_for_status()
+            stations = parse_station_table(response.text)
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump(stations, f)
+        except Exception as e:
+            print(f"Could not refresh station table ({e}); using cached/known stations")
+            stations = {}
+            if os.path.exists(cache_path):
+                with open(cache_path) as f:
+                    stations = {k: tuple(v) for k, v in json.load(f).items()}
+    for station, coords in KNOWN_STATIONS.items():
+        stations.setdefault(station, coords)
+    return StationRegistry(stations)
@@ -0,0 +1,131 @@
+"""Streaming parser for NDBC stdmet text files (.txt or .txt.gz).
+
+Reads the raw bytes in fixed-size blocks, skips `#` header lines as they go by
+and converts each block straight into column arrays, so only one block of text
+is held in memory at a time.
+"""
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+
+from buoy.loader import COLUMNS, DTYPES
+from buoy.quality import FLAG_COLUMN, mask_arrays
+
+BLOCK_SIZE = 1 << 20
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_source(source):
+    """Return (stream, file) for a path or a byte stream.
+
+    stream yields decompressed text bytes; file is the handle we opened ourselves
+    (None for caller-owned streams, which are left open).
+    """
+    opened = open(source, "rb") if isinstance(source, str) else None
+    stream = opened or source
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+    return stream, opened
+
+
+def _header_names(line):
+    names = line.lstrip(b"#").decode("ascii").split()
+    # Older files spell the year column YYYY
+    return ["YY" if name == "YYYY" else name for name in names]
+
+
+def iter_blocks(source, block_size=BLOCK_SIZE):
+    """Yield (names, values) per block, values being a 2-D float64 array of rows.
+
+    names comes from the first header line, or COLUMNS if the file has none.
+    """
+    stream, opened = open_source(source)
+    names = None
+    carry = b""
+    try:
+        while True:
+            block = stream.read(block_size)
+            if not block and not carry:
+                break
+            data = carry + block
+            if block:
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    carry = data
+                    continue
+                data, carry = data[:cut], data[cut:]
+            else:
+                carry = b""
+
+            if b"#" in data or names is None:
+                lines = data.splitlines()
+                rows = []
+                for line in lines:
+                    if line.startswith(b"#") or line[:1].isalpha():
+                        if names is None:
+                            names = _header_names(line)
+                        continue
+                    rows.append(line)
+                data = b"\n".join(rows)
+                if names is None and rows:
+                    names = COLUMNS[:len(rows[0].split())]
+
+            values = np.fromstring(data.decode("ascii"), dtype=np.float64, sep=" ")
+            if values.size == 0:
+                continue
+            if values.size % len(names):
+                raise ValueError(f"Ragged rows: {values.size} values for {len(names)} columns")
+            yield names, values.reshape(-1, len(names))
+    finally:
+        if opened is not None:
+            opened.close()
+
+
+def iter_stdmet(source, block_size=BLOCK_SIZE, mask=False):
+    """Yield one DataFrame per block, with the dtypes from buoy.loader.
+
+    mask=True applies buoy.quality: sentinels become NaN and a QC column is added.
+    """
+    for names, values in iter_blocks(source, block_size):
+        columns = {name: values[:, i].astype(DTYPES.get(name, "float64"))
+                   for i, name in enumerate(names)}
+        if mask:
+            columns[FLAG_COLUMN] = mask_arrays(columns)
+        yield pd.DataFrame(columns)
+
+
+def read_stdmet(source, block_size=BLOCK_SIZE, capacity=None, mask=False):
+    """Parse a whole stdmet file into a DataFrame.
+
+    Column arrays are preallocated (from capacity, or grown by doubling) and filled
+    block by block, so no intermediate text copy of the file is ever built.
+    mask=True masks sentinels in those arrays in place and adds the QC bitmask
+    (see buoy.quality).
+    """
+    columns = None
+    size = 0
+    for names, values in iter_blocks(source, block_size):
+        n = len(values)
+        if columns is None:
+            capacity = max(capacity or 0, n, 1024)
+            columns = {name: np.empty(capacity, dtype=DTYPES.get(name, "float64")) for name in names}
+        if size + n > len(next(iter(columns.values()))):
+            new_capacity = max(2 * (size + n), 1024)
+            for name in columns:
+                grown = np.empty(new_capacity, dtype=columns[name].dtype)
+                grown[:size] = columns[name][:size]
+                columns[name] = grown
+        for i, name in enumerate(names):
+            columns[name][size:size + n] = values[:, i]
+        size += n
+
+    if columns is None:
+        return pd.DataFrame({name: pd.Series(dtype=DTYPES[name]) for name in COLUMNS})
+    columns = {name: arr[:size] for name, arr in columns.items()}
+    if mask:
+        columns[FLAG_COLUMN] = mask_arrays(columns)
+    return pd.DataFrame(columns)
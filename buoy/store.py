@@ -0,0 +1,236 @@
+"""Append-only buoy data store partitioned by station and year (optionally month).
+
+Layout under the store root:
+
+    station=44025/year=2019/part-0000.feather
+    station=44025/year=2019/part-0001.feather      (appended later)
+    station=44025/year=2019/WVHT.kll.npz            quantile sketch of the partition
+    station=44025/year=2019/WVHT~WSPD.ols.npz       regression sums of the partition
+    _manifest.json                                 rows and newest reading per partition
+    _cube.feather                                  station x year x month climatology cube
+    _storms.feather, _daily_wvht.feather           storm catalog (buoy.catalog)
+
+Ingesting only writes rows newer than what a partition already holds, as a new
+part file, so adding a month never rewrites or re-reads earlier data. Rows are
+masked as they are ingested (buoy.quality: sentinels become NaN, plus a QC
+bitmask), so every reader gets clean values. Readers open only the partitions
+a query asks for.
+"""
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from buoy import regression
+from buoy.cube import ClimatologyCube
+from buoy.quality import FLAG_COLUMN, mask_frame
+from buoy.sketch import DEFAULT_K, KLLSketch, exact_quantile, merge_all
+from buoy.stdmet import read_stdmet
+from buoy.timeparse import time_key
+
+MANIFEST = "_manifest.json"
+CUBE = "_cube.feather"
+SKETCH_COLUMNS = ["WVHT", "WSPD", "GST"]
+# (target, features) fits kept per partition
+REGRESSIONS = [("WVHT", ["WSPD"])]
+
+
+def row_keys(df):
+    year_col = "YY" if "YY" in df.columns else "Year"
+    return time_key(df[year_col].to_numpy(), df["MM"].to_numpy(), df["DD"].to_numpy(),
+                    df["hh"].to_numpy(), df["mm"].to_numpy())
+
+
+class PartitionedStore:
+    def __init__(self, root, by_month=False, sketch_columns=SKETCH_COLUMNS,
+                 regressions=REGRESSIONS):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, MANIFEST)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {"by_month": by_month, "sketch_columns": list(sketch_columns),
+                             "regressions": [[t, list(f)] for t, f in regressions],
+                             "partitions": {}}
+        self.by_month = self.manifest["by_month"]
+        self.sketch_columns = self.manifest.get("sketch_columns", [])
+        self.regressions = [(t, list(f)) for t, f in self.manifest.get("regressions", [])]
+        self.cube = ClimatologyCube(os.path.join(root, CUBE))
+
+    def partition_key(self, station, year, month=None):
+        key = f"station={station}/year={int(year)}"
+        if self.by_month:
+            key += f"/month={int(month):02d}"
+        return key
+
+    def save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def ingest(self, df, station):
+        """Append a station's rows. Returns the number of rows actually written."""
+        if df.empty:
+            return 0
+        df = df.reset_index(drop=True)
+        keys = row_keys(df)
+        year_col = "YY" if "YY" in df.columns else "Year"
+        group_cols = [year_col, "MM"] if self.by_month else [year_col]
+
+        written = []
+        for group, idx in df.groupby(group_cols, sort=True).indices.items():
+            group = group if isinstance(group, tuple) else (group,)
+            pkey = self.partition_key(station, *group)
+            info = self.manifest["partitions"].setdefault(pkey, {"rows": 0, "max_key": -1, "parts": []})
+            idx = idx[keys[idx] > info["max_key"]]
+            if len(idx) == 0:
+                continue
+            idx = idx[np.argsort(keys[idx], kind="stable")]
+
+            rows = df.iloc[idx].reset_index(drop=True)
+            if FLAG_COLUMN not in rows.columns:
+                mask_frame(rows)
+            part = f"part-{len(info['parts']):04d}.feather"
+            os.makedirs(os.path.join(self.root, pkey), exist_ok=True)
+            feather.write_feather(rows, os.path.join(self.root, pkey, part), compression="uncompressed")
+            self._update_sketches(pkey, rows)
+            self._update_regressions(pkey, rows)
+            info["parts"].append(part)
+            info["rows"] += len(idx)
+            info["max_key"] = int(keys[idx[-1]])
+            written.append(rows)
+
+        if written:
+            self.cube.add(pd.concat(written, ignore_index=True), station)
+        self.save_manifest()
+        return sum(len(rows) for rows in written)
+
+    def sketch_path(self, pkey, column):
+        return os.path.join(self.root, pkey, f"{column}.kll.npz")
+
+    def _update_sketches(self, pkey, rows):
+        for column in self.sketch_columns:
+            if column not in rows.columns:
+                continue
+            path = self.sketch_path(pkey, column)
+            # Seeded per partition and size so re-ingesting the same rows gives the same sketch
+            seed = [zlib.crc32(f"{pkey}/{column}".encode()), len(rows)]
+            sketch = KLLSketch.load(path, seed) if os.path.exists(path) else KLLSketch(seed=seed)
+            sketch.update(rows[column].to_numpy())
+            sketch.save(path)
+
+    def regression_path(self, pkey, target, features):
+        return os.path.join(self.root, pkey, f"{target}~{'+'.join(features)}.ols.npz")
+
+    def _update_regressions(self, pkey, rows):
+        for target, features in self.regressions:
+            if not set(features + [target]) <= set(rows.columns):
+                continue
+            path = self.regression_path(pkey, target, features)
+            stats = (regression.OLSStats.load(path) if os.path.exists(path)
+                     else regression.OLSStats(features, target))
+            stats.update_frame(rows)
+            stats.save(path)
+
+    def ingest_file(self, path, station):
+        """Parse a downloaded stdmet .txt.gz file and append it."""
+        return self.ingest(read_stdmet(path, mask=True), station)
+
+    def partitions(self, stations=None, years=None, months=None):
+        """Partition keys matching the selection (None means everything)."""
+        stations = None if stations is None else {str(s) for s in stations}
+        years = None if years is None else {int(y) for y in years}
+        months = None if months is None else {int(m) for m in months}
+        selected = []
+        for pkey in sorted(self.manifest["partitions"]):
+            fields = dict(part.split("=") for part in pkey.split("/"))
+            if stations is not None and fields["station"] not in stations:
+                continue
+            if years is not None and int(fields["year"]) not in years:
+                continue
+            if months is not None and self.by_month and int(fields["month"]) not in months:
+                continue
+            selected.append(pkey)
+        return selected
+
+    def read(self, stations=None, years=None, months=None, columns=None):
+        """Read the selected partitions into one frame with a station_id column.
+
+        With a yearly layout a month selection is applied as a row filter after
+        reading; with a monthly layout only those months' files are opened.
+        """
+        filter_months = months is not None and not self.by_month
+        read_columns = columns
+        if filter_months and columns is not None and "MM" not in columns:
+            read_columns = list(columns) + ["MM"]
+
+        frames = []
+        for pkey in self.partitions(stations, years, months):
+            station = pkey.split("/")[0].split("=")[1]
+            for part in self.manifest["partitions"][pkey]["parts"]:
+                # Memory-mapped, so opening every column costs nothing until to_pandas
+                table = feather.read_table(os.path.join(self.root, pkey, part), memory_map=True)
+                unmasked = FLAG_COLUMN not in table.column_names
+                frame = table.to_pandas() if read_columns is None else \
+                    table.select(read_columns).to_pandas()
+                if unmasked:
+                    # A part written before ingest masked sentinels
+                    mask_frame(frame)
+                    if read_columns is not None and FLAG_COLUMN not in read_columns:
+                        frame = frame.drop(columns=FLAG_COLUMN)
+                frame["station_id"] = station
+                frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=(columns or []) + ["station_id"])
+        df = pd.concat(frames, ignore_index=True)
+        if filter_months:
+            df = df[df["MM"].isin([int(m) for m in months])].reset_index(drop=True)
+            if read_columns is not columns:
+                df = df.drop(columns="MM")
+        return df
+
+    def sketch(self, column, stations=None, years=None, months=None):
+        """Merged quantile sketch of a column over the selected partitions.
+
+        With a yearly layout a month selection cannot be honoured from the
+        per-year sketches, so it is rejected rather than silently ignored.
+        """
+        if months is not None and not self.by_month:
+            raise ValueError("Month selections need a store created with by_month=True")
+        pkeys = [pkey for pkey in self.partitions(stations, years, months)
+                 if os.path.exists(self.sketch_path(pkey, column))]
+        sketches = [KLLSketch.load(self.sketch_path(pkey, column)) for pkey in pkeys]
+        # Seeded from the (sorted) selection so a query always returns the same value
+        seed = zlib.crc32("\n".join(pkeys + [column]).encode())
+        return merge_all(sketches, k=DEFAULT_K, seed=seed)
+
+    def quantile(self, column, q, stations=None, years=None, months=None, exact=False):
+        """Quantile of a column (missing readings left out) from the partition sketches.
+
+        exact=True reads the raw partitions and uses pandas instead, for checking
+        the sketch against the 0054 computation.
+        """
+        if exact:
+            values = self.read(stations, years, months, columns=[column])[column]
+            return exact_quantile(values, q)
+        return self.sketch(column, stations, years, months).quantile(q)
+
+    def regression(self, target="WVHT", features=("WSPD",), stations=None, years=None,
+                   months=None):
+        """Merged OLSStats of target on features over the selected partitions.
+
+        Rows missing any of the variables are left out of the sums.
+        """
+        if months is not None and not self.by_month:
+            raise ValueError("Month selections need a store created with by_month=True")
+        features = list(features)
+        stats = [regression.OLSStats.load(self.regression_path(pkey, target, features))
+                 for pkey in self.partitions(stations, years, months)
+                 if os.path.exists(self.regression_path(pkey, target, features))]
+        return regression.merge_all(stats, features, target)
@@ -0,0 +1,361 @@
+"""Storm-event detection for the 0055 analyses.
+
+`storm_events_pandas` is the original run-length grouping from 0055/0006.py and is
+kept as the reference. `detect_storms` produces the same table from a stream of
+time-ordered chunks with constant memory: `TimeInterpolator` reproduces
+`interpolate(method='time')` across chunk boundaries and `StormDetector` is a
+state machine that carries an open storm from one chunk into the next.
+"""
+import numpy as np
+import pandas as pd
+
+from buoy.quality import SENTINELS, masked
+
+WSPD_THRESHOLD = 15.0
+WVHT_THRESHOLD = 2.0
+
+EVENT_COLUMNS = ['storm_group', 'max_wspd', 'mean_wspd', 'max_wvht', 'mean_wvht',
+                 'start_time', 'end_time', 'duration', 'intensity_score']
+
+
+def storm_events_pandas(df, wspd_threshold=WSPD_THRESHOLD, wvht_threshold=WVHT_THRESHOLD):
+    """The 0055 path: df has datetime, WSPD and WVHT, already interpolated."""
+    df = df[['datetime', 'WSPD', 'WVHT']].copy()
+    df['is_storm'] = (df['WSPD'] > wspd_threshold) & (df['WVHT'] > wvht_threshold)
+    df['storm_group'] = (df['is_storm'] != df['is_storm'].shift()).cumsum()
+    df.loc[~df['is_storm'], 'storm_group'] = 0
+
+    storm_events = df[df['is_storm']].groupby('storm_group').agg({
+        'WSPD': ['max', 'mean'],
+        'WVHT': ['max', 'mean'],
+        'datetime': ['min', 'max', 'count']
+    }).reset_index()
+    storm_events.columns = EVENT_COLUMNS[:-1]
+    storm_events['intensity_score'] = storm_events['max_wspd'] * storm_events['max_wvht']
+    return storm_events
+
+
+def interpolate_pandas(df):
+    """The 0055 cleaning step: 99.0 -> NaN, then time interpolation of WSPD/WVHT."""
+    df = df.set_index('datetime')
+    for col in ['WSPD', 'WVHT']:
+        df[col] = df[col].replace(SENTINELS[col], np.nan).interpolate(method='time')
+    return df.reset_index()
+
+
+class TimeInterpolator:
+    """Streaming equivalent of `interpolate(method='time')` for a few columns.
+
+    Rows after a column's last valid value are held back (raw) until the next
+    valid value arrives, so only the current gap is ever buffered. Leading NaNs
+    stay NaN and trailing NaNs take the last valid value, as in pandas. Each gap
+    is filled by np.interp between the same two readings pandas would use, so
+    the values match exactly.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.last = {col: None for col in columns}  # last valid (time, value) before pending rows
+        self.pending = None  # raw rows not yet emitted: dict of arrays
+
+    def _fill(self, x, y, col, upto):
+        # Fill NaNs in y[:upto] that have a valid reading before them
+        valid = ~np.isnan(y)
+        xp, fp = x[valid], y[valid]
+        if self.last[col] is not None:
+            xp = np.concatenate([[self.last[col][0]], xp])
+            fp = np.concatenate([[self.last[col][1]], fp])
+        if not len(xp):
+            return y
+        gap = ~valid
+        gap[upto:] = False
+        if self.last[col] is None:
+            gap[:np.flatnonzero(valid)[0]] = False  # leading NaNs stay NaN
+        out = y.copy()
+        out[gap] = np.interp(x[gap], xp, fp)
+        return out
+
+    def update(self, times, values):
+        """Feed a chunk (times array, dict of column arrays). Returns the ready rows."""
+        chunk = {'time': np.asarray(times)}
+        chunk.update({col: np.asarray(values[col], dtype=np.float64) for col in self.columns})
+        if self.pending is not None:
+            chunk = {key: np.concatenate([self.pending[key], chunk[key]]) for key in chunk}
+
+        x = chunk['time'].view('i8')
+        # Rows are ready once every column's gap around them is closed
+        ready = len(x)
+        for col in self.columns:
+            valid = np.flatnonzero(~np.isnan(chunk[col]))
+            if len(valid):
+                ready = min(ready, valid[-1] + 1)
+            elif self.last[col] is not None:
+                ready = 0
+
+        out = {'time': chunk['time'][:ready]}
+        for col in self.columns:
+            y = chunk[col]
+            out[col] = self._fill(x, y, col, ready)[:ready]
+            valid = np.flatnonzero(~np.isnan(y[:ready]))
+            if len(valid):
+                self.last[col] = (x[valid[-1]], y[valid[-1]])
+        self.pending = {key: arr[ready:] for key, arr in chunk.items()}
+        return out
+
+    def finish(self):
+        """Flush held-back rows; trailing NaNs take each column's last valid value."""
+        if self.pending is None:
+            return None
+        x = self.pending['time'].view('i8')
+        out = {'time': self.pending['time']}
+        for col in self.columns:
+            out[col] = self._fill(x, self.pending[col], col, len(x))
+        self.pending = None
+        return out
+
+
+def interpolate_frame(df, columns=('WSPD', 'WVHT')):
+    """interpolate_pandas through TimeInterpolator: same values, no set_index copy.
+
+    df must be sorted by datetime; returns datetime and the interpolated columns.
+    """
+    columns = list(columns)
+    values = {col: masked(df[col].to_numpy(), col) for col in columns}
+    interpolator = TimeInterpolator(columns)
+    parts = [interpolator.update(df['datetime'].to_numpy(), values), interpolator.finish()]
+    parts = [part for part in parts if part is not None]
+    return pd.DataFrame({'datetime': np.concatenate([part['time'] for part in parts]),
+                         **{col: np.concatenate([part[col] for part in parts]) for col in columns}})
+
+
+def _kahan_run_sums(values, starts, lengths, sums, comps):
+    # pandas' groupby mean uses Kahan summation; replay it one position at a
+    # time across all runs so means match bit for bit
+    for k in range(lengths.max() if len(lengths) else 0):
+        active = lengths > k
+        val = values[starts[active] + k]
+        y = val - comps[active]
+        t = sums[active] + y
+        comps[active] = t - sums[active] - y
+        sums[active] = t
+    return sums, comps
+
+
+class StormDetector:
+    """Constant-memory run-length storm detector.
+
+    Feed time-ordered chunks to update(); it returns the storms that closed inside
+    the chunk. A storm still running at the end of a chunk is carried over, and
+    finish() returns it once the stream ends. storm_group numbers every run of
+    storm/non-storm rows exactly like the pandas cumsum idiom.
+    """
+
+    def __init__(self, wspd_threshold=WSPD_THRESHOLD, wvht_threshold=WVHT_THRESHOLD):
+        self.wspd_threshold = wspd_threshold
+        self.wvht_threshold = wvht_threshold
+        self.prev_state = None
+        self.group = 0
+        self.open = None  # running aggregates for a storm spanning chunks
+
+    def update(self, times, wspd, wvht):
+        times = np.asarray(times)
+        wspd = np.asarray(wspd, dtype=np.float64)
+        wvht = np.asarray(wvht, dtype=np.float64)
+        n = len(times)
+        if n == 0:
+            return []
+
+        is_storm = (wspd > self.wspd_threshold) & (wvht > self.wvht_threshold)
+        events = []
+        if self.open is not None and not is_storm[0]:
+            events.append(self._close_open())
+
+        change = np.empty(n, dtype=bool)
+        change[0] = is_storm[0] != self.prev_state
+        change[1:] = is_storm[1:] != is_storm[:-1]
+        run_starts = np.flatnonzero(change)
+        groups = self.group + np.arange(1, len(run_starts) + 1)
+        # Rows before the first change continue the previous chunk's last run
+        if len(run_starts) == 0 or run_starts[0] != 0:
+            run_starts = np.concatenate([[0], run_starts])
+            groups = np.concatenate([[self.group], groups])
+        run_ends = np.append(run_starts[1:], n)
+
+        storm_runs = is_storm[run_starts]
+        starts = run_starts[storm_runs]
+        ends = run_ends[storm_runs]
+        groups = groups[storm_runs]
+        self.prev_state = bool(is_storm[-1])
+        self.group += int(change.sum())
+        m = len(starts)
+        if m == 0:
+            return events
+
+        lengths = ends - starts
+        max_wspd = _segment_max(wspd, starts, ends)
+        max_wvht = _segment_max(wvht, starts, ends)
+        counts = lengths.astype(np.int64)
+        sum_wspd, comp_wspd = np.zeros(m), np.zeros(m)
+        sum_wvht, comp_wvht = np.zeros(m), np.zeros(m)
+        start_times = times[starts]
+        end_times = times[ends - 1]
+
+        # Continue a storm left open by the previous chunk
+        if self.open is not None:
+            o = self.open
+            max_wspd[0] = max(max_wspd[0], o['max_wspd'])
+            max_wvht[0] = max(max_wvht[0], o['max_wvht'])
+            sum_wspd[0], comp_wspd[0] = o['sum_wspd'], o['comp_wspd']
+            sum_wvht[0], comp_wvht[0] = o['sum_wvht'], o['comp_wvht']
+            counts[0] += o['count']
+            start_times[0] = o['start_time']
+            self.open = None
+
+        _kahan_run_sums(wspd, starts, lengths, sum_wspd, comp_wspd)
+        _kahan_run_sums(wvht, starts, lengths, sum_wvht, comp_wvht)
+
+        closed = m
+        if ends[-1] == n:
+            # Still storming at the end of the chunk: keep it open
+            closed = m - 1
+            self.open = {
+                'group': groups[-1], 'max_wspd': max_wspd[-1], 'max_wvht': max_wvht[-1],
+                'sum_wspd': sum_wspd[-1], 'comp_wspd': comp_wspd[-1],
+                'sum_wvht': sum_wvht[-1], 'comp_wvht': comp_wvht[-1],
+                'count': counts[-1], 'start_time': start_times[-1], 'end_time': end_times[-1],
+            }
+        for i in range(closed):
+            events.append(self._event(groups[i], max_wspd[i], sum_wspd[i], max_wvht[i],
+                                      sum_wvht[i], start_times[i], end_times[i], counts[i]))
+        return events
+
+    def _event(self, group, max_wspd, sum_wspd, max_wvht, sum_wvht, start, end, count):
+        return {
+            'storm_group': int(group),
+            'max_wspd': max_wspd, 'mean_wspd': sum_wspd / count,
+            'max_wvht': max_wvht, 'mean_wvht': sum_wvht / count,
+            'start_time': start, 'end_time': end, 'duration': int(count),
+            'intensity_score': max_wspd * max_wvht,
+        }
+
+    def _close_open(self):
+        o = self.open
+        self.open = None
+        return self._event(o['group'], o['max_wspd'], o['sum_wspd'], o['max_wvht'],
+                           o['sum_wvht'], o['start_time'], o['end_time'], o['count'])
+
+    def finish(self):
+        return [self._close_open()] if self.open is not None else []
+
+
+def segment_reduce(ufunc, values, starts, ends):
+    """ufunc.reduce over each [start, end) span; spans must be non-empty, in any order.
+
+    Gaps between spans are handled by interleaving the end positions into the
+    reduceat indices and keeping every other result.
+    """
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = ends
+    at_end = np.asarray(ends) == len(values)
+    if at_end[:-1].any():
+        # A span other than the last ends at the array end (e.g. storms in
+        # intensity order): pad one element so len(values) is a valid index.
+        # Every span still stops at its own end, so no span covers the pad.
+        values = np.concatenate([values, values[-1:]])
+    elif len(at_end) and at_end[-1]:
+        bounds = bounds[:-1]
+    return ufunc.reduceat(values, bounds)[0::2]
+
+
+def _segment_max(values, starts, ends):
+    return segment_reduce(np.maximum, values, starts, ends)
+
+
+def iter_file_chunks(source):
+    """Chunks of a stdmet file with a datetime column, ready for detect_storms."""
+    from buoy.stdmet import iter_stdmet
+    from buoy.timeparse import add_datetime
+
+    for chunk in iter_stdmet(source):
+        add_datetime(chunk)
+        yield chunk
+
+
+def detect_storms(chunks, wspd_threshold=WSPD_THRESHOLD, wvht_threshold=WVHT_THRESHOLD):
+    """Storm table from time-ordered raw chunks (datetime, WSPD, WVHT columns).
+
+    Applies the same 99.0 masking and time interpolation as the 0055 scripts,
+    chunk by chunk, and returns the same columns as storm_events_pandas.
+    """
+    interpolator = TimeInterpolator(['WSPD', 'WVHT'])
+    detector = StormDetector(wspd_threshold, wvht_threshold)
+    events = []
+
+    def feed(rows):
+        if rows is not None and len(rows['time']):
+            events.extend(detector.update(rows['time'], rows['WSPD'], rows['WVHT']))
+
+    for chunk in chunks:
+        values = {col: masked(chunk[col].to_numpy(), col) for col in ['WSPD', 'WVHT']}
+        feed(interpolator.update(chunk['datetime'].to_numpy(), values))
+    feed(interpolator.finish())
+    events.extend(detector.finish())
+
+    storm_events = pd.DataFrame(events, columns=EVENT_COLUMNS)
+    return storm_events.astype({'storm_group': 'int64', 'duration': 'int64'})
+
+
+def storm_overviews(df, storm_events):
+    """Min/max/mean WSPD and WVHT over every storm's time span in one pass.
+
+    df must be sorted by datetime. Each storm's rows are located with
+    searchsorted instead of a boolean mask over the whole frame, and the
+    statistics come from segment reductions, so cost does not grow with the
+    number of storms. NaNs are skipped like Series.min/max/mean.
+    """
+    times = df['datetime'].to_numpy()
+    start_times = storm_events['start_time'].to_numpy().astype(times.dtype)
+    end_times = storm_events['end_time'].to_numpy().astype(times.dtype)
+    starts = np.searchsorted(times, start_times, side='left')
+    ends = np.searchsorted(times, end_times, side='right')
+
+    overview = pd.DataFrame({
+        'storm_group': storm_events['storm_group'].to_numpy(),
+        'start_time': storm_events['start_time'].to_numpy(),
+        'end_time': storm_events['end_time'].to_numpy(),
+        'duration_hours': (end_times - start_times) / np.timedelta64(1, 'h'),
+    })
+    if not len(starts):
+        return overview
+    for col, name in [('WSPD', 'wspd'), ('WVHT', 'wvht')]:
+        values = df[col].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        counts = segment_reduce(np.add, valid.astype(np.int64), starts, ends)
+        overview[f'{name}_min'] = segment_reduce(np.fmin, values, starts, ends)
+        overview[f'{name}_max'] = segment_reduce(np.fmax, values, starts, ends)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            overview[f'{name}_mean'] = segment_reduce(np.add, np.where(valid, values, 0.0),
+                                                      starts, ends) / counts
+    return overview
+
+
+def overview_dicts(overview, storm_events):
+    """The per-storm dicts the 0055 scripts print, built from storm_overviews()."""
+    events = storm_events.set_index('storm_group')
+    records = []
+    for row in overview.itertuples(index=False):
+        storm = events.loc[row.storm_group]
+        records.append({
+            'Storm ID': row.storm_group,
+            'Start Time': pd.Timestamp(row.start_time),
+            'End Time': pd.Timestamp(row.end_time),
+            'Duration (hours)': row.duration_hours,
+            'Max Wind Speed (m/s)': storm['max_wspd'],
+            'Wind Speed Range (m/s)': [row.wspd_min, row.wspd_max],
+            'Mean Wind Speed (m/s)': row.wspd_mean,
+            'Max Wave Height (m)': storm['max_wvht'],
+            'Wave Height Range (m)': [row.wvht_min, row.wvht_max],
+            'Mean Wave Height (m)': row.wvht_mean,
+        })
+    return records
@@ -0,0 +1,204 @@
+"""Synthetic NDBC stdmet data for benchmarking the 0053-0056 pipelines.
+
+Each station gets a seasonal wave-height cycle (rougher in winter), wind that
+drives the waves, gusts tied to the wind, a dozen storms a year with falling
+pressure, and the usual gaps: sensor outages written as the NDBC sentinels
+(99.0 for winds and waves, 999 for directions, 9999.0 for pressure, 999.0 for
+temperatures) plus runs of rows that were never transmitted. Output uses the
+same columns as all_stations_october_2012.csv, so every script and helper can
+read it unchanged:
+
+    python -m buoy.synthetic synthetic.csv --stations 40 --years 2019 2020
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from buoy.quality import SENTINELS
+
+SAMPLE_ROWS = 1431  # rows in 0056/all_stations_october_2012.csv
+STEP_MINUTES = 10
+FIRST_STATION = 90001
+
+# Sensors that fail together
+SENSOR_GROUPS = [["WDIR", "WSPD", "GST"], ["WVHT", "DPD", "APD", "MWD"], ["PRES"],
+                 ["ATMP", "DEWP"], ["WTMP"]]
+
+
+def smooth_noise(rng, n, window, scale):
+    """Zero-mean noise correlated over roughly `window` readings."""
+    noise = rng.normal(0, 1, n + window)
+    kernel = np.hanning(window)
+    kernel /= np.sqrt((kernel ** 2).sum())
+    return scale * np.convolve(noise, kernel, mode="valid")[:n]
+
+
+def storm_profile(rng, minutes, storms_per_year):
+    """0..1 storm strength per reading: raised-cosine bumps of 6-72 hours."""
+    span = minutes[-1] - minutes[0] + STEP_MINUTES
+    count = rng.poisson(storms_per_year * span / (365 * 24 * 60))
+    strength = np.zeros(len(minutes))
+    for centre, hours, peak in zip(rng.uniform(minutes[0], minutes[-1], count),
+                                   rng.uniform(6, 72, count), rng.uniform(0.5, 1.0, count)):
+        half = hours * 30
+        lo, hi = np.searchsorted(minutes, [centre - half, centre + half])
+        phase = (minutes[lo:hi] - centre) / half
+        strength[lo:hi] = np.maximum(strength[lo:hi], peak * 0.5 * (1 + np.cos(np.pi * phase)))
+    return strength
+
+
+def _outages(rng, n, rate, mean_length):
+    """Boolean mask of random outage runs covering about `rate` of the rows."""
+    mask = np.zeros(n, dtype=bool)
+    count = rng.poisson(rate * n / mean_length)
+    for start, length in zip(rng.integers(0, n, count), rng.geometric(1 / mean_length, count)):
+        mask[start:start + length] = True
+    return mask
+
+
+def generate_station(years, seed=None, storms_per_year=12, gap_rate=0.02, drop_rate=0.01,
+                     start=None, periods=None):
+    """One station's readings for whole years (or `periods` readings from `start`)."""
+    rng = np.random.default_rng(seed)
+    if periods is None:
+        first = np.datetime64(f"{min(years)}-01-01T00:00", "m")
+        last = np.datetime64(f"{max(years) + 1}-01-01T00:00", "m")
+        periods = int((last - first) // np.timedelta64(STEP_MINUTES, "m"))
+    else:
+        first = np.datetime64(start or f"{min(years)}-01-01T00:00", "m")
+    # NDBC stations report a few minutes off the hour; keep one offset per station
+    offset = int(rng.integers(0, STEP_MINUTES))
+    stamps = first + np.timedelta64(offset, "m") + np.arange(periods) * np.timedelta64(STEP_MINUTES, "m")
+    minutes = stamps.astype(np.int64).astype(np.float64)
+    n = periods
+
+    season = np.cos(2 * np.pi * ((stamps.astype("datetime64[D]") - stamps.astype("datetime64[Y]"))
+                                 .astype(np.int64) - 20) / 365.25)  # 1 in late January
+    storm = storm_profile(rng, minutes, storms_per_year)
+
+    wspd = np.clip(6.5 + 1.5 * season + smooth_noise(rng, n, 36, 2.2) + 22 * storm, 0, None)
+    gst = wspd * (1.25 + np.abs(smooth_noise(rng, n, 6, 0.08))) + rng.gamma(1.5, 0.3, n)
+    # Waves lag the wind by a few hours
+    lagged = np.concatenate([np.full(18, wspd[0]), wspd[:-18]]) if n > 18 else wspd
+    wvht = np.clip(0.35 + 0.45 * season + 0.11 * lagged + smooth_noise(rng, n, 48, 0.25)
+                   + 3.5 * storm, 0.1, None)
+    dpd = np.clip(4 + 2.2 * np.sqrt(wvht) + rng.normal(0, 1.0, n), 2, 20)
+    apd = np.clip(0.7 * dpd + rng.normal(0, 0.4, n), 2, 15)
+    wdir = (200 + np.cumsum(rng.normal(0, 4, n))) % 360
+    mwd = (wdir + rng.normal(0, 25, n)) % 360
+    pres = 1016 - 4 * season + smooth_noise(rng, n, 144, 4) - 35 * storm
+    wtmp = 21 - 5 * season + smooth_noise(rng, n, 288, 0.4)
+    atmp = wtmp - 1.5 * season + smooth_noise(rng, n, 36, 1.2)
+    dewp = atmp - np.abs(smooth_noise(rng, n, 36, 3))
+
+    stamp_parts = pd.DatetimeIndex(stamps)
+    df = pd.DataFrame({
+        "YY": stamp_parts.year.astype("int16"), "MM": stamp_parts.month.astype("int8"),
+        "DD": stamp_parts.day.astype("int8"), "hh": stamp_parts.hour.astype("int8"),
+        "mm": stamp_parts.minute.astype("int8"),
+        "WDIR": wdir.astype("int16"), "WSPD": wspd.round(1), "GST": gst.round(1),
+        "WVHT": wvht.round(2), "DPD": dpd.round(2), "APD": apd.round(2),
+        "MWD": mwd.astype("int16"), "PRES": pres.round(1), "ATMP": atmp.round(1),
+        "WTMP": wtmp.round(1), "DEWP": dewp.round(1),
+        "VIS": np.full(n, 99.0), "TIDE": np.full(n, 99.0),  # buoys do not report these
+    })
+    for group in SENSOR_GROUPS:
+        outage = _outages(rng, n, gap_rate, 12)
+        for col in group:
+            df.loc[outage, col] = SENTINELS[col]
+    keep = ~_outages(rng, n, drop_rate, 6)
+    return df[keep].reset_index(drop=True)
+
+
+def station_ids(n_stations):
+    return [str(FIRST_STATION + i) for i in range(n_stations)]
+
+
+def station_location(station, seed=0):
+    """A stable made-up position off the US east coast."""
+    rng = np.random.default_rng([seed, int(station)])
+    return round(float(rng.uniform(25, 42)), 3), round(float(rng.uniform(-80, -65)), 3)
+
+
+def iter_stations(n_stations, years, seed=0, **kwargs):
+    """(station_id, frame with station_id/latitude/longitude) for each station."""
+    for i, station in enumerate(station_ids(n_stations)):
+        df = generate_station(years, seed=[seed, i], **kwargs)
+        lat, lon = station_location(station, seed)
+        df["station_id"] = int(station)
+        df["latitude"], df["longitude"] = lat, lon
+        yield station, df
+
+
+def generate(n_stations, years, seed=0, **kwargs):
+    """All stations in the 0056 CSV layout."""
+    return pd.concat([df for _, df in iter_stations(n_stations, years, seed, **kwargs)],
+                     ignore_index=True)
+
+
+def write_csv(path, n_stations, years, seed=0, **kwargs):
+    """Write the 0056 CSV layout one station at a time. Returns the row count."""
+    rows = 0
+    with open(path, "w", newline="") as f:
+        for i, (_, df) in enumerate(iter_stations(n_stations, years, seed, **kwargs)):
+            df.to_csv(f, header=i == 0, index=False)
+            rows += len(df)
+    return rows
+
+
+def write_stdmet_files(dest_dir, n_stations, years, seed=0, **kwargs):
+    """Write <station>h<year>.txt.gz files like NDBC's historical archive."""
+    from buoy.standin import write_fixture
+
+    os.makedirs(dest_dir, exist_ok=True)
+    paths = []
+    for station, df in iter_stations(n_stations, years, seed, **kwargs):
+        for year, rows in df.groupby("YY"):
+            path = os.path.join(dest_dir, f"{station}h{year}.txt.gz")
+            write_fixture(rows, path)
+            paths.append(path)
+    return paths
+
+
+def scale_plan(scale):
+    """(stations, kwargs for generate_station) giving about SAMPLE_ROWS * scale rows.
+
+    Small scales shorten the record (like the 12-day 0056 sample); larger ones
+    add whole years and then stations.
+    """
+    rows = SAMPLE_ROWS * scale
+    per_year = 365 * 24 * 60 // STEP_MINUTES
+    if rows <= 4 * per_year:
+        return 4, {"years": [2012], "start": "2012-10-20", "periods": max(int(rows / 4), 1)}
+    years = min(int(np.ceil(rows / (4 * per_year))), 10)
+    stations = int(np.ceil(rows / (years * per_year)))
+    return stations, {"years": list(range(2015, 2015 + years))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic NDBC stdmet data")
+    parser.add_argument("path", help="CSV file, or a directory with --stdmet")
+    parser.add_argument("--stations", type=int, default=4)
+    parser.add_argument("--years", type=int, nargs="+", default=[2012])
+    parser.add_argument("--scale", type=int, help="size relative to the 0056 sample "
+                        "(overrides --stations/--years)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stdmet", action="store_true", help="write .txt.gz files per station-year")
+    args = parser.parse_args()
+
+    if args.scale:
+        stations, kwargs = scale_plan(args.scale)
+    else:
+        stations, kwargs = args.stations, {"years": args.years}
+    if args.stdmet:
+        paths = write_stdmet_files(args.path, stations, seed=args.seed, **kwargs)
+        print(f"Wrote {len(paths)} files to {args.path}")
+    else:
+        rows = write_csv(args.path, stations, seed=args.seed, **kwargs)
+        print(f"Wrote {rows:,} rows for {stations} stations to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
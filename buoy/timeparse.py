@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)
+
+
+def days_from_civil(year, month, day):
+    """Days since 1970-01-01 for proleptic Gregorian dates (H. Hinnant's algorithm)."""
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    mp = (month + 9) % 12  # March = 0 ... February = 11
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def build_datetime(year, month, day, hour, minute):
+    """Build datetime64[ns] values from integer time-part arrays.
+
+    Returns (values, valid) where valid is False for impossible dates such as
+    2023-02-29 or hour 24; those rows come back as NaT. Two-digit years from
+    old NDBC files are read as 19xx.
+    """
+    year = np.asarray(year, dtype=np.int32)
+    month = np.asarray(month, dtype=np.int32)
+    day = np.asarray(day, dtype=np.int32)
+    hour = np.asarray(hour, dtype=np.int32)
+    minute = np.asarray(minute, dtype=np.int32)
+
+    year = np.where(year < 100, year + 1900, year)
+
+    month_ok = (month >= 1) & (month <= 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = DAYS_IN_MONTH[np.where(month_ok, month, 0)] + (leap & (month == 2))
+    valid = (month_ok & (day >= 1) & (day <= month_days)
+             & (hour >= 0) & (hour <= 23) & (minute >= 0) & (minute <= 59))
+
+    # Day and minute arithmetic fits in int32; only the final scale needs int64
+    days = days_from_civil(year, month, day).astype(np.int64)
+    ns = days * NS_PER_DAY + (hour * 60 + minute).astype(np.int64) * NS_PER_MINUTE
+    ns[~valid] = np.iinfo(np.int64).min  # NaT
+    return ns.view("datetime64[ns]"), valid
+
+
+def add_datetime(df, column="datetime"):
+    """Add a datetime column built from YY (or Year), MM, DD, hh, mm.
+
+    Returns the validity mask so callers can drop or report bad rows.
+    """
+    year_col = "YY" if "YY" in df.columns else "Year"
+    values, valid = build_datetime(df[year_col].to_numpy(), df["MM"].to_numpy(),
+                                   df["DD"].to_numpy(), df["hh"].to_numpy(),
+                                   df["mm"].to_numpy())
+    df[column] = pd.Series(values, index=df.index)
+    return valid
+
+
+def time_key(year, month, day, hour=0, minute=0):
+    """Pack time parts into one sortable int64 of the form YYYYMMDDhhmm."""
+    year = np.asarray(year, dtype=np.int64)
+    year = np.where(year < 100, year + 1900, year)
+    return (((year * 100 + np.asarray(month, dtype=np.int64)) * 100
+             + np.asarray(day, dtype=np.int64)) * 100
+            + np.asarray(hour, dtype=np.int64)) * 100 + np.asarray(minute, dtype=np.int64)
+
+
+def range_mask(df, start, end):
+    """Boolean mask of rows whose YY/MM/DD/hh/mm fall within [start, end].
+
+    Compares packed integer keys, so no datetime column is needed.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    year_col = "YY" if "YY" in df.columns else "Year"
+    key = time_key(df[year_col].to_numpy(), df["MM"].to_numpy(), df["DD"].to_numpy(),
+                   df["hh"].to_numpy(), df["mm"].to_numpy())
+    lo = time_key(start.year, start.month, start.day, start.hour, start.minute)
+    hi = time_key(end.year, end.month, end.day, end.hour, end.minute)
+    return (key >= lo) & (key <= hi)
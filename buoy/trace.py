@@ -0,0 +1,178 @@
+"""Per-stage timing and memory trace for the analysis scripts.
+
+    tracer = Tracer()
+    with tracer.stage("load") as s:
+        df = pd.read_csv(filename)
+        s.rows_out = len(df)
+    with tracer.stage("clean", rows_in=len(df)) as s:
+        ...
+    tracer.save("trace.json")
+    print(tracer.summary())
+
+Stages can nest (their names are joined with "/"), and `tracer.track("name")`
+decorates a function, taking rows in/out from the length of its first argument
+and of its result. Each stage records wall time, CPU time, rows in/out and the
+tracemalloc peak it needed on top of what was already allocated. Traces are
+plain JSON, so two runs can be compared with
+
+    python -m buoy.trace diff before.json after.json
+"""
+import argparse
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+BAR_WIDTH = 30
+
+
+class StageRecord:
+    def __init__(self, path, rows_in=None, depth=0):
+        self.path = path
+        self.depth = depth
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = 0
+
+    def to_dict(self):
+        return {"stage": self.path, "depth": self.depth, "wall_s": round(self.wall, 6),
+                "cpu_s": round(self.cpu, 6), "rows_in": self.rows_in, "rows_out": self.rows_out,
+                "peak_mb": round(self.peak / 2 ** 20, 3)}
+
+
+def _rows(obj):
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+class Tracer:
+    def __init__(self, memory=True, enabled=True):
+        """memory=False skips tracemalloc, which slows allocation-heavy Python code."""
+        self.memory = memory
+        self.enabled = enabled
+        self.records = []
+        self._stack = []  # (record, traced bytes when it started)
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        if not self.enabled:
+            yield StageRecord(name, rows_in)
+            return
+        parent = self._stack[-1][0] if self._stack else None
+        record = StageRecord(f"{parent.path}/{name}" if parent else name, rows_in, len(self._stack))
+        self.records.append(record)
+
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                # Keep what the parent has reached so far before resetting the peak
+                parent.peak = max(parent.peak, peak - self._stack[-1][1])
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        self._stack.append((record, current))
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.process_time() - cpu
+            self._stack.pop()
+            if self.memory:
+                record.peak = max(record.peak, tracemalloc.get_traced_memory()[1] - current)
+                if parent is not None:
+                    parent.peak = max(parent.peak, record.peak + current - self._stack[-1][1])
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def track(self, name=None):
+        """Decorator form of stage()."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__,
+                                rows_in=_rows(args[0]) if args else None) as record:
+                    result = func(*args, **kwargs)
+                    record.rows_out = _rows(result)
+                return result
+            return wrapper
+        return decorate
+
+    def to_dict(self):
+        return {"stages": [r.to_dict() for r in self.records]}
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def summary(self):
+        return format_summary(self.to_dict())
+
+
+def load_trace(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_summary(trace):
+    """Indented stage tree with a bar proportional to wall time (flame-graph style)."""
+    stages = trace["stages"]
+    total = sum(s["wall_s"] for s in stages if s["depth"] == 0) or 1.0
+    width = max([len(s["stage"].rsplit("/", 1)[-1]) + 2 * s["depth"] for s in stages] + [5])
+    lines = [f"{'stage':<{width}} {'wall s':>9} {'cpu s':>9} {'rows in':>12} {'rows out':>12} "
+             f"{'peak MB':>9}"]
+    for s in stages:
+        label = "  " * s["depth"] + s["stage"].rsplit("/", 1)[-1]
+        bar = "#" * max(1, round(BAR_WIDTH * s["wall_s"] / total))
+        rows_in = "" if s["rows_in"] is None else f"{s['rows_in']:,}"
+        rows_out = "" if s["rows_out"] is None else f"{s['rows_out']:,}"
+        lines.append(f"{label:<{width}} {s['wall_s']:>9.3f} {s['cpu_s']:>9.3f} {rows_in:>12} "
+                     f"{rows_out:>12} {s['peak_mb']:>9.1f}  {bar}")
+    return "\n".join(lines)
+
+
+def diff_traces(before, after):
+    """Per-stage wall time and peak memory of two traces side by side."""
+    old = {s["stage"]: s for s in before["stages"]}
+    new = {s["stage"]: s for s in after["stages"]}
+    order = [s["stage"] for s in after["stages"]] + [k for k in old if k not in new]
+    width = max([len(k) for k in order] + [5])
+    lines = [f"{'stage':<{width}} {'before s':>9} {'after s':>9} {'ratio':>7} "
+             f"{'before MB':>10} {'after MB':>9}"]
+    for key in order:
+        a, b = old.get(key), new.get(key)
+        before_s = f"{a['wall_s']:.3f}" if a else "-"
+        after_s = f"{b['wall_s']:.3f}" if b else "-"
+        ratio = f"{b['wall_s'] / a['wall_s']:.2f}x" if a and b and a["wall_s"] else "-"
+        before_mb = f"{a['peak_mb']:.1f}" if a else "-"
+        after_mb = f"{b['peak_mb']:.1f}" if b else "-"
+        lines.append(f"{key:<{width}} {before_s:>9} {after_s:>9} {ratio:>7} {before_mb:>10} {after_mb:>9}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or compare stage traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show")
+    show.add_argument("trace")
+    diff = sub.add_parser("diff")
+    diff.add_argument("before")
+    diff.add_argument("after")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        print(format_summary(load_trace(args.trace)))
+    else:
+        print(diff_traces(load_trace(args.before), load_trace(args.after)))
+
+
+if __name__ == "__main__":
+    main()
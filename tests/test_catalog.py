@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from buoy.catalog import StormCatalog
+from buoy.store import PartitionedStore
+
+
+def station_frame(times, wspd, wvht):
+    return pd.DataFrame({
+        "YY": times.year.astype("int16"), "MM": times.month.astype("int8"),
+        "DD": times.day.astype("int8"), "hh": times.hour.astype("int8"),
+        "mm": times.minute.astype("int8"), "WSPD": wspd, "WVHT": wvht,
+    })
+
+
+def test_update_matches_rebuild_across_long_outage(tmp_path):
+    # Calm for 5 days, a 4-day outage, then a storm: interpolation ramps up
+    # inside the outage, so the storm starts before the first reading after it
+    times = pd.date_range("2012-10-01", "2012-10-15", freq="10min")
+    wspd = np.where(times < "2012-10-10", 5.0, 25.0)
+    wvht = np.where(times < "2012-10-10", 1.0, 4.0)
+    outage = (times >= "2012-10-06") & (times < "2012-10-10")
+    wspd[outage] = 99.0
+    wvht[outage] = 99.0
+    df = station_frame(times, wspd, wvht)
+
+    # The first ingest stops 3 days into the outage, more than LOOKBACK before the cut
+    store = PartitionedStore(str(tmp_path / "store"))
+    first = times < "2012-10-09"
+    store.ingest(df[first], "41010")
+    catalog = StormCatalog(store)
+    catalog.update()
+    store.ingest(df[~first], "41010")
+    catalog.update()
+    incremental = catalog.events.copy()
+
+    rebuilt = StormCatalog(store)
+    rebuilt.rebuild()
+    assert len(rebuilt.events) == 1
+    assert rebuilt.events["start_time"].iloc[0] < pd.Timestamp("2012-10-10")
+    pd.testing.assert_frame_equal(incremental, rebuilt.events)
+    pd.testing.assert_frame_equal(catalog.daily, rebuilt.daily)
+
+
+def test_update_reads_only_new_partitions_without_valid_wvht(tmp_path, monkeypatch):
+    # WVHT is never reported, so there is no last valid wave height to go back to
+    times = pd.date_range("2011-01-01", "2014-03-01", freq="1h", inclusive="left")
+    wspd = 10.0 + 10.0 * np.sin(np.arange(len(times)) / 24.0)
+    df = station_frame(times, wspd, np.full(len(times), 99.0))
+
+    store = PartitionedStore(str(tmp_path / "store"))
+    first = times < "2014-01-01"
+    store.ingest(df[first], "41010")
+    catalog = StormCatalog(store)
+    catalog.update()
+
+    store.ingest(df[~first], "41010")
+    read = store.read
+    read_years = []
+
+    def recording_read(stations=None, years=None, months=None, columns=None):
+        read_years.extend(years)
+        return read(stations, years, months, columns)
+
+    # The scan resumes a day before the end of 2013; 2011 and 2012 stay unread
+    monkeypatch.setattr(store, "read", recording_read)
+    assert catalog.update() == ["41010"]
+    assert sorted(set(read_years)) == [2013, 2014]
+
+    monkeypatch.undo()
+    rebuilt = StormCatalog(store)
+    rebuilt.rebuild()
+    pd.testing.assert_frame_equal(catalog.events, rebuilt.events)
+    pd.testing.assert_frame_equal(catalog.daily, rebuilt.daily)
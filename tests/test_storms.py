@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from buoy.storms import detect_storms, interpolate_pandas, segment_reduce, storm_events_pandas
+
+
+def reference(ufunc, values, starts, ends):
+    return np.array([ufunc.reduce(values[s:e]) for s, e in zip(starts, ends)])
+
+
+@pytest.mark.parametrize("spans", [
+    [(2, 10), (7, 10)],
+    [(0, 10), (0, 10)],
+    [(7, 10), (0, 3), (4, 10)],
+    [(3, 5), (0, 10)],
+    [(5, 6), (0, 2)],
+])
+@pytest.mark.parametrize("ufunc", [np.add, np.fmax, np.fmin])
+def test_segment_reduce_unordered_spans_ending_at_array_end(spans, ufunc):
+    values = np.arange(10, dtype=np.float64)
+    starts, ends = (np.array(side) for side in zip(*spans))
+    np.testing.assert_array_equal(segment_reduce(ufunc, values, starts, ends),
+                                  reference(ufunc, values, starts, ends))
+
+
+def gappy_frame(seed=0):
+    # Irregular 10-minute readings with storms, sentinel outages, NaN runs,
+    # dropped rows and a missing start and end
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2012-10-01", periods=3000, freq="10min")
+    times = times[rng.random(len(times)) > 0.1]
+    n = len(times)
+    surge = np.sin(np.arange(n) / 90.0) ** 8
+    wspd = 6.0 + 20.0 * surge + rng.normal(0, 1.5, n)
+    wvht = 1.0 + 3.0 * surge + rng.normal(0, 0.3, n)
+    for _ in range(12):
+        start, length = rng.integers(n), rng.integers(1, 60)
+        column = wspd if rng.random() < 0.5 else wvht
+        column[start:start + length] = 99.0 if rng.random() < 0.5 else np.nan
+    wspd[:5] = 99.0
+    wvht[-7:] = np.nan
+    return pd.DataFrame({"datetime": times, "WSPD": wspd, "WVHT": wvht})
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 37, 500, 10000])
+def test_detect_storms_matches_pandas_across_gaps(chunk_rows):
+    df = gappy_frame()
+    expected = storm_events_pandas(interpolate_pandas(df))
+    chunks = [df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)]
+    events = detect_storms(chunks)
+    assert len(expected) > 1
+    pd.testing.assert_frame_equal(events, expected)